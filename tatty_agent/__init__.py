@@ -79,8 +79,10 @@ After installation, you have access to:
 """
 
 import asyncio
+from collections import deque
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union, Dict, Any, List
+from typing import Optional, Union, Dict, Any, Iterator, List
 
 # Apply nest_asyncio if we're in an environment that needs it (like Jupyter)
 try:
@@ -100,7 +102,6 @@ except RuntimeError:
 from .core.runtime import AgentRuntime
 from .core.state import AgentState, AgentCallbacks
 from .config import TattyConfig, load_config, ProjectInitializer
-from .tools import execute_tool
 
 
 class TattyAgent:
@@ -122,6 +123,9 @@ class TattyAgent:
     # Run a task
     result = agent.run("Find all Python files in this project")
 
+    # ...or, inside an event loop (e.g. a notebook cell)
+    result = await agent.arun("Find all Python files in this project")
+
     # Execute specific tool
     files = agent.execute_tool("Glob", pattern="**/*.py")
 
@@ -173,8 +177,9 @@ class TattyAgent:
         # Initialize runtime
         self.runtime = AgentRuntime(self.state, self.callbacks)
 
-        # Conversation history
-        self._conversation_history: List[Dict[str, Any]] = []
+        # Conversation history, bounded so long-running agents don't grow
+        # without limit; the oldest entries are dropped first
+        self._conversation_history: deque[Dict[str, Any]] = deque(maxlen=self.config.history_max)
 
     def _create_library_callbacks(self) -> AgentCallbacks:
         """Create callbacks appropriate for library usage"""
@@ -192,9 +197,13 @@ class TattyAgent:
 
         return callbacks
 
-    def run(self, query: str, max_iterations: Optional[int] = None) -> str:
+    async def arun(self, query: str, max_iterations: Optional[int] = None) -> str:
         """
-        Run the agent with a query and return the final result.
+        Run the agent with a query and return the final result (coroutine).
+
+        Use this from code that already runs in an event loop, such as a
+        notebook cell or an async application; it awaits the agent loop
+        directly instead of starting a nested one.
 
         Args:
             query: The task or question for the agent
@@ -205,7 +214,7 @@ class TattyAgent:
 
         Example:
             ```python
-            result = agent.run("Find all Python files and count lines of code")
+            result = await agent.arun("Find all Python files and count lines of code")
             print(result)
             ```
         """
@@ -219,8 +228,7 @@ class TattyAgent:
         })
 
         try:
-            # Run the agent loop (nest_asyncio applied at import time if needed)
-            result = asyncio.run(self.runtime.run_loop(query, iterations))
+            result = await self.runtime.run_loop(query, iterations)
 
             # Add result to conversation history
             self._conversation_history.append({
@@ -231,16 +239,46 @@ class TattyAgent:
 
             return result
 
+        except Exception as e:
+            return self._record_error(f"Agent execution failed: {str(e)}")
+
+    def run(self, query: str, max_iterations: Optional[int] = None) -> str:
+        """
+        Run the agent with a query and return the final result.
+
+        Blocking wrapper around arun(); inside a running event loop, prefer
+        `await agent.arun(...)`.
+
+        Args:
+            query: The task or question for the agent
+            max_iterations: Override default max iterations
+
+        Returns:
+            The agent's final response
+
+        Example:
+            ```python
+            result = agent.run("Find all Python files and count lines of code")
+            print(result)
+            ```
+        """
+        try:
+            # Inside a running loop this relies on nest_asyncio (applied at
+            # import time if needed)
+            return asyncio.run(self.arun(query, max_iterations))
         except KeyboardInterrupt:
             return "Agent execution interrupted by user"
         except Exception as e:
-            error_msg = f"Agent execution failed: {str(e)}"
-            self._conversation_history.append({
-                "type": "error",
-                "content": error_msg,
-                "timestamp": self._get_timestamp()
-            })
-            return error_msg
+            return self._record_error(f"Agent execution failed: {str(e)}")
+
+    def _record_error(self, error_msg: str) -> str:
+        """Add an error to the conversation history and return its message"""
+        self._conversation_history.append({
+            "type": "error",
+            "content": error_msg,
+            "timestamp": self._get_timestamp()
+        })
+        return error_msg
 
     def ask(self, question: str) -> str:
         """
@@ -285,7 +323,10 @@ class TattyAgent:
 
     def get_conversation_history(self) -> List[Dict[str, Any]]:
         """
-        Get the conversation history.
+        Get a snapshot of the conversation history.
+
+        Only the most recent `config.history_max` entries are kept. To walk
+        the entries without copying them, use iter_conversation_history().
 
         Returns:
             List of conversation entries with timestamps
@@ -297,7 +338,19 @@ class TattyAgent:
                 print(f"{entry['timestamp']}: {entry['type']} - {entry['content'][:100]}")
             ```
         """
-        return self._conversation_history.copy()
+        return list(self._conversation_history)
+
+    def iter_conversation_history(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the conversation history without copying it.
+
+        The history must not be modified (e.g. by running the agent) while
+        the iterator is in use.
+
+        Returns:
+            Iterator over conversation entries, oldest first
+        """
+        return iter(self._conversation_history)
 
     def clear_conversation_history(self) -> None:
         """Clear the conversation history."""
@@ -354,7 +407,6 @@ class TattyAgent:
 
     def _get_timestamp(self) -> str:
         """Get current timestamp for conversation history"""
-        from datetime import datetime
         return datetime.now().isoformat()
 
     def __repr__(self) -> str:
@@ -480,4 +532,14 @@ __all__ = [
 from .config import TattyConfig, load_config
 from .core.runtime import AgentRuntime
 from .core.state import AgentState
-from .config import ProjectInitializer
\ No newline at end of file
+from .config import ProjectInitializer
+
+
+def __getattr__(name: str):
+    # Importing the tool registry imports every tool module, so it is loaded
+    # on first use (the runtime's first tool call, or tatty_agent.execute_tool)
+    # rather than with the package
+    if name == "execute_tool":
+        from .tools import execute_tool
+        return execute_tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,7 +10,6 @@ import asyncio
 import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
 
 from ..core.runtime import AgentRuntime
 from ..core.state import AgentState, AgentCallbacks
@@ -21,7 +20,15 @@ class CLICallbacks(AgentCallbacks):
 
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
-        super().__init__()
+        # The dataclass __init__ assigns every callback field, which would
+        # shadow the methods below with None; wire them in explicitly
+        super().__init__(
+            on_iteration=self.on_iteration,
+            on_tool_start=self.on_tool_start,
+            on_tool_result=self.on_tool_result,
+            on_agent_reply=self.on_agent_reply,
+            on_status_update=self.on_status_update
+        )
 
     async def on_iteration(self, iteration: int, depth: int):
         """Handle iteration updates"""
@@ -32,20 +39,22 @@ class CLICallbacks(AgentCallbacks):
     async def on_tool_start(self, tool_name: str, params: dict, tool_idx: int, total_tools: int, depth: int):
         """Handle tool execution start"""
         indent = "  " * depth
-        print(f"{indent}🛠️  Executing {tool_name}...")
+        lines = [f"{indent}🛠️  Executing {tool_name}..."]
         if self.verbose and params:
-            for key, value in params.items():
-                if value is not None:
-                    print(f"{indent}   {key}: {value}")
+            lines.extend(f"{indent}   {key}: {value}" for key, value in params.items() if value is not None)
+        # One write per event; a line-buffered terminal would otherwise take
+        # a write call per parameter
+        print("\n".join(lines))
 
     async def on_tool_result(self, result: str, depth: int):
         """Handle tool execution result"""
         indent = "  " * depth
-        print(f"{indent}✅ Tool completed")
         if self.verbose and result:
             # Truncate long results in verbose mode
             display_result = result[:200] + "..." if len(result) > 200 else result
-            print(f"{indent}📄 Result: {display_result}")
+            print(f"{indent}✅ Tool completed\n{indent}📄 Result: {display_result}")
+        else:
+            print(f"{indent}✅ Tool completed")
 
     async def on_agent_reply(self, message: str):
         """Handle agent reply to user"""
@@ -66,6 +75,54 @@ async def agent_loop(user_message: str, max_iterations: int = 20, working_dir: s
     return await runtime.run_loop(user_message, max_iterations)
 
 
+def _resolve_dir(path: str) -> str:
+    """Resolve a --dir argument, exiting with an error unless it is a directory"""
+    work_dir = Path(path).resolve()
+    # A single stat in the common case; exists() only tells the errors apart
+    if not work_dir.is_dir():
+        if work_dir.exists():
+            print(f"❌ Error: Not a directory: {work_dir}")
+        else:
+            print(f"❌ Error: Directory does not exist: {work_dir}")
+        sys.exit(1)
+    return str(work_dir)
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create the CLI's event loop, using uvloop when it is installed.
+
+    uvloop (libuv-based, not available on Windows) schedules tasks and handles
+    socket and subprocess I/O faster than the default selector loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+def _run_query(loop: asyncio.AbstractEventLoop, coro) -> str:
+    """
+    Run a coroutine to completion on the CLI's long-lived event loop.
+
+    On Ctrl-C the task is cancelled and allowed to unwind (killing any
+    subprocess it started) before KeyboardInterrupt propagates, as
+    asyncio.run would do, so nothing from the interrupted query keeps
+    running on the reused loop.
+    """
+    task = loop.create_task(coro)
+    try:
+        return loop.run_until_complete(task)
+    except KeyboardInterrupt:
+        task.cancel()
+        try:
+            loop.run_until_complete(task)
+        except (asyncio.CancelledError, Exception):
+            pass
+        raise
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -135,31 +192,14 @@ Examples:
     if args.tui:
         from ..tui.app import run_tui
 
-        work_dir = None
-        if args.dir:
-            work_dir = Path(args.dir).resolve()
-            if not work_dir.exists():
-                print(f"❌ Error: Directory does not exist: {work_dir}")
-                sys.exit(1)
-            if not work_dir.is_dir():
-                print(f"❌ Error: Not a directory: {work_dir}")
-                sys.exit(1)
-            work_dir = str(work_dir)
+        work_dir = _resolve_dir(args.dir) if args.dir else None
 
         run_tui(working_dir=work_dir, initial_query=args.query)
         return
 
     # Set working directory for CLI mode
     if args.dir:
-        work_dir = str(Path(args.dir).resolve())
-        work_dir_path = Path(work_dir)
-        if not work_dir_path.exists():
-            print(f"❌ Error: Directory does not exist: {work_dir}")
-            sys.exit(1)
-        if not work_dir_path.is_dir():
-            print(f"❌ Error: Not a directory: {work_dir}")
-            sys.exit(1)
-
+        work_dir = _resolve_dir(args.dir)
         os.chdir(work_dir)
         print(f"📁 Working directory: {work_dir}")
     else:
@@ -177,64 +217,78 @@ Examples:
     # Interactive loop or single command
     first_query = args.query
 
-    while True:
-        try:
-            if first_query:
-                query = first_query
-                first_query = None  # Only use the first query once
-            else:
-                print("\n" + "=" * 60)
-                query = input("📝 Enter your command (or 'exit' to quit): ").strip()
-
-                if not query:
-                    continue
-
-                if query.lower() in ['exit', 'quit', 'q']:
-                    print("👋 Goodbye!")
-                    break
+    # One event loop serves every query of the session, so the HTTP
+    # connection pools and worker threads created by earlier queries stay
+    # warm for later ones
+    loop = _new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        while True:
+            try:
+                if first_query:
+                    query = first_query
+                    first_query = None  # Only use the first query once
+                else:
+                    print("\n" + "=" * 60)
+                    query = input("📝 Enter your command (or 'exit' to quit): ").strip()
+
+                    if not query:
+                        continue
+
+                    if query.lower() in ['exit', 'quit', 'q']:
+                        print("👋 Goodbye!")
+                        break
+
+                # Skip generic startup commands that don't provide meaningful tasks
+                if query.strip().lower() in ["start", "begin", "go"]:
+                    print(f"\n📝 Query: {query}")
+                    print("🚀 TATty Agent ready! Please enter a specific command or task.")
+                    print("💡 Examples: 'List files', 'Search for Python functions', 'Explain this code'")
+                    if not args.interactive:
+                        break  # In non-interactive mode, exit after showing help
+                    continue  # In interactive mode, ask for another command
 
-            # Skip generic startup commands that don't provide meaningful tasks
-            if query.strip().lower() in ["start", "begin", "go"]:
                 print(f"\n📝 Query: {query}")
-                print("🚀 TATty Agent ready! Please enter a specific command or task.")
-                print("💡 Examples: 'List files', 'Search for Python functions', 'Explain this code'")
+                print("🔄 Running agent...")
+                print("=" * 60)
+
+                # Run the agent
+                result = _run_query(loop, agent_loop(query, max_iterations=20, working_dir=work_dir, verbose=args.verbose))
+
+                print(f"\n{'='*60}")
+                print(f"✅ Final result:\n{result}")
+                print(f"{'='*60}")
+
+                # If not in interactive mode, exit after first query
                 if not args.interactive:
-                    break  # In non-interactive mode, exit after showing help
-                continue  # In interactive mode, ask for another command
-
-            print(f"\n📝 Query: {query}")
-            print("🔄 Running agent...")
-            print("=" * 60)
-
-            # Run the agent
-            result = asyncio.run(agent_loop(query, max_iterations=20, working_dir=work_dir, verbose=args.verbose))
-
-            print(f"\n{'='*60}")
-            print(f"✅ Final result:\n{result}")
-            print(f"{'='*60}")
-
-            # If not in interactive mode, exit after first query
-            if not args.interactive:
-                break
-
-        except KeyboardInterrupt:
-            print("\n\n⚠️  Interrupted by user")
-            if args.interactive:
-                continue  # Go back to prompt
-            else:
-                sys.exit(130)
-        except Exception as e:
-            print(f"\n\n❌ Error: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
-            if not args.interactive:
-                sys.exit(1)
-            # In interactive mode, continue to next query
+                    break
+
+            except KeyboardInterrupt:
+                print("\n\n⚠️  Interrupted by user")
+                if args.interactive:
+                    continue  # Go back to prompt
+                else:
+                    sys.exit(130)
+            except Exception as e:
+                print(f"\n\n❌ Error: {e}")
+                if args.verbose:
+                    import traceback
+                    traceback.print_exc()
+                if not args.interactive:
+                    sys.exit(1)
+                # In interactive mode, continue to next query
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        asyncio.set_event_loop(None)
+        loop.close()
 
 
 def cli_main():
     """Entry point for the tatty-agent command-line script"""
+    # Imported here so that importing the CLI module doesn't pay for dotenv
+    from dotenv import load_dotenv
+
     # Load .env file with override=True to override shell environment variables
     load_dotenv(override=True)
 
@@ -32,6 +32,7 @@ class TattyConfig:
     # Execution settings
     max_iterations: int = 20
     timeout: int = 120
+    history_max: int = 1000  # Conversation entries kept by TattyAgent
 
     # UI preferences
     verbose: bool = False
@@ -70,6 +71,14 @@ class TattyConfig:
         if not self.fast_model:
             self.fast_model = "gpt-3.5-turbo"
 
+        _validate_history_max(self.history_max)
+
+
+def _validate_history_max(history_max: Any) -> None:
+    """Reject history sizes that would keep no conversation entries"""
+    if isinstance(history_max, bool) or not isinstance(history_max, int) or history_max < 1:
+        raise ValueError(f"history_max must be a positive integer, got {history_max!r}")
+
 
 class ConfigLoader:
     """Loads configuration from various sources"""
@@ -89,6 +98,7 @@ class ConfigLoader:
             f"{prefix}FAST_MODEL": "fast_model",
             f"{prefix}MAX_ITERATIONS": "max_iterations",
             f"{prefix}TIMEOUT": "timeout",
+            f"{prefix}HISTORY_MAX": "history_max",
             f"{prefix}VERBOSE": "verbose",
             f"{prefix}DEBUG": "debug",
             f"{prefix}COLORIZE": "colorize",
@@ -162,6 +172,8 @@ class ConfigLoader:
 
     def get_config(self) -> TattyConfig:
         """Get the final configuration"""
+        # Loaders set fields after __post_init__ ran, so check again here
+        _validate_history_max(self.config.history_max)
         return self.config
 
     def _convert_env_value(self, attr_name: str, value: str) -> Any:
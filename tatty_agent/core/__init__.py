@@ -10,11 +10,13 @@ This module provides the foundational classes and functions for agent execution:
 """
 
 from .runtime import AgentRuntime
-from .state import AgentState, AgentCallbacks
+from .state import AgentState, AgentCallbacks, acquire_state, release_state
 from .types import *
 
 __all__ = [
     'AgentRuntime',
     'AgentState',
-    'AgentCallbacks'
+    'AgentCallbacks',
+    'acquire_state',
+    'release_state'
 ]
\ No newline at end of file
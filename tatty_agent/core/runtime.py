@@ -1,6 +1,7 @@
 """
 Core agent runtime - shared between CLI, TUI, and library modes
 """
+import asyncio
 from typing import Optional
 
 from ..baml_client import types
@@ -23,6 +24,18 @@ class AgentRuntime:
         # Set global state reference for tool interrupt checking
         AgentRuntime._current_state = state
 
+    @classmethod
+    def request_interrupt(cls) -> None:
+        """
+        Ask the running agent to stop before its next model call or tool.
+
+        Only sets a flag, so it is safe to call from another thread such as a
+        UI callback.
+        """
+        state = cls._current_state
+        if state is not None:
+            state.interrupt_requested = True
+
     # @trace
     async def execute_tool(self, tool: types.AgentTools, depth: int = 0) -> str:
         """Execute a tool, handling sub-agents specially"""
@@ -42,8 +55,8 @@ class AgentRuntime:
         preventing sub-agents from spawning more sub-agents (infinite recursion protection).
         """
         # Notify UI
-        if self.callbacks.on_sub_agent_start:
-            await self.callbacks.on_sub_agent_start(tool.description, tool.prompt, parent_depth + 1)
+        if on_sub_agent_start := self.callbacks.on_sub_agent_start:
+            await on_sub_agent_start(tool.description, tool.prompt, parent_depth + 1)
 
         # Create isolated message context for sub-agent
         sub_messages: list[types.Message] = []
@@ -54,41 +67,46 @@ class AgentRuntime:
                 return "Sub-agent interrupted by user"
 
             # Update iteration tracking
-            if self.callbacks.on_iteration:
-                await self.callbacks.on_iteration(sub_iteration + 1, parent_depth + 1)
+            if on_iteration := self.callbacks.on_iteration:
+                await on_iteration(sub_iteration + 1, parent_depth + 1)
 
             # Call BAML SubAgentLoop with retry logic for parsing failures
             response = None
-            temp_sub_messages = sub_messages.copy()
+            # Invalid-response notes are only kept for this call's retries;
+            # truncating them afterwards avoids copying the context per iteration
+            context_len = len(sub_messages)
             max_retries = 3
 
-            for retry in range(max_retries):
-                try:
-                    response = await b.SubAgentLoop(goal=tool.prompt, state=temp_sub_messages, working_dir=self.state.working_dir)
-                    break  # Success!
-                except BamlValidationError as e:
-                    if not e.raw_output.startswith("```json") and not e.raw_output.startswith("{") and not e.raw_output.startswith("["):
-                        # Plain text response, treat as reply
-                        response = types.ReplyToUser(message=e.raw_output, action="reply_to_user")
-                        break
-                    else:
-                        # Invalid structured response, add error to temp messages and retry
-                        temp_sub_messages.append(types.Message(
-                            role="assistant",
-                            message=f"Returned an invalid response: {e.raw_output}.\n Must be one of the types specified."
-                        ))
-                        if retry == max_retries - 1:
-                            return f"Sub-agent failed to return valid response after {max_retries} attempts"
-                except Exception as e:
-                    return f"Sub-agent error: {str(e)}"
+            try:
+                for retry in range(max_retries):
+                    try:
+                        response = await b.SubAgentLoop(goal=tool.prompt, state=sub_messages, working_dir=self.state.working_dir)
+                        break  # Success!
+                    except BamlValidationError as e:
+                        if not e.raw_output.startswith("```json") and not e.raw_output.startswith("{") and not e.raw_output.startswith("["):
+                            # Plain text response, treat as reply
+                            response = types.ReplyToUser(message=e.raw_output, action="reply_to_user")
+                            break
+                        else:
+                            # Invalid structured response, add error for the retry
+                            sub_messages.append(types.Message(
+                                role="assistant",
+                                message=f"Returned an invalid response: {e.raw_output}.\n Must be one of the types specified."
+                            ))
+                            if retry == max_retries - 1:
+                                return f"Sub-agent failed to return valid response after {max_retries} attempts"
+                    except Exception as e:
+                        return f"Sub-agent error: {str(e)}"
+            finally:
+                del sub_messages[context_len:]
 
             if response is None:
                 return "Sub-agent failed to return a response"
 
             # Check for reply
             if isinstance(response, types.ReplyToUser):
-                if self.callbacks.on_sub_agent_complete:
-                    await self.callbacks.on_sub_agent_complete(response.message, parent_depth + 1)
+                if on_sub_agent_complete := self.callbacks.on_sub_agent_complete:
+                    await on_sub_agent_complete(response.message, parent_depth + 1)
                 return f"Sub-agent completed:\nTask: {tool.description}\nResult: {response.message}"
 
             # Execute single tool
@@ -96,8 +114,8 @@ class AgentRuntime:
                 if self.state.interrupt_requested:
                     return "Sub-agent interrupted by user"
 
-                if self.callbacks.on_tool_start:
-                    await self.callbacks.on_tool_start(
+                if on_tool_start := self.callbacks.on_tool_start:
+                    await on_tool_start(
                         response.action,
                         response.model_dump(exclude={'action'}),
                         1,
@@ -108,8 +126,8 @@ class AgentRuntime:
                 # Execute tool (sub-agents can't spawn more sub-agents)
                 result = await self.execute_tool(response, parent_depth + 1)
 
-                if self.callbacks.on_tool_result:
-                    await self.callbacks.on_tool_result(result, parent_depth + 1)
+                if on_tool_result := self.callbacks.on_tool_result:
+                    await on_tool_result(result, parent_depth + 1)
 
                 # Add tool call with full parameters as assistant message
                 tool_params = response.model_dump()
@@ -138,44 +156,50 @@ class AgentRuntime:
             return (True, "Agent execution interrupted by user")
 
         # Notify UI
-        if self.callbacks.on_iteration:
-            await self.callbacks.on_iteration(self.state.current_iteration, depth)
+        if on_iteration := self.callbacks.on_iteration:
+            await on_iteration(self.state.current_iteration, depth)
 
         # Call BAML agent with retry logic for parsing failures
-        if self.callbacks.on_status_update:
-            await self.callbacks.on_status_update("Thinking...", self.state.current_iteration)
+        if on_status_update := self.callbacks.on_status_update:
+            await on_status_update("Thinking...", self.state.current_iteration)
 
         response = None
-        temp_messages = self.state.messages.copy()
+        # Invalid-response notes are only kept for this call's retries;
+        # truncating them afterwards avoids copying the history per iteration
+        messages = self.state.messages
+        history_len = len(messages)
         max_retries = 3
 
-        for retry in range(max_retries):
-            try:
-                response = await b.AgentLoop(state=temp_messages, working_dir=self.state.working_dir)
-                if isinstance(response, types.ReplyToUser):
-                    if response.message.startswith("Tool:"):
-                        temp_messages.append(types.Message(role="assistant", message=f"Returned an invalid response: {response.message}.\n Must be one of the types specified."))
-                        if retry == max_retries - 1:
-                            return (True, f"Agent failed to return valid response after {max_retries} attempts")
+        try:
+            for retry in range(max_retries):
+                try:
+                    response = await b.AgentLoop(state=messages, working_dir=self.state.working_dir)
+                    if isinstance(response, types.ReplyToUser):
+                        if response.message.startswith("Tool:"):
+                            messages.append(types.Message(role="assistant", message=f"Returned an invalid response: {response.message}.\n Must be one of the types specified."))
+                            if retry == max_retries - 1:
+                                return (True, f"Agent failed to return valid response after {max_retries} attempts")
+                        else:
+                            break
                     else:
+                        break # Success!
+                except BamlValidationError as e:
+                    if not e.raw_output.startswith("```json") and not e.raw_output.startswith("{") and not e.raw_output.startswith("[") and not e.raw_output.startswith("Tool:"):
+                        # Plain text response, treat as reply
+                        response = types.ReplyToUser(message=e.raw_output, action="reply_to_user")
                         break
-                else:
-                    break # Success!
-            except BamlValidationError as e:
-                if not e.raw_output.startswith("```json") and not e.raw_output.startswith("{") and not e.raw_output.startswith("[") and not e.raw_output.startswith("Tool:"):
-                    # Plain text response, treat as reply
-                    response = types.ReplyToUser(message=e.raw_output, action="reply_to_user")
-                    break
-                else:
-                    # Invalid structured response, add error to temp messages and retry
-                    temp_messages.append(types.Message(
-                        role="assistant",
-                        message=f"Returned an invalid response: {e.raw_output}.\n Must be one of the types specified."
-                    ))
-                    if retry == max_retries - 1:
-                        return (True, f"Agent failed to return valid response after {max_retries} attempts")
-            except Exception as e:
-                return (True, f"Error calling agent: {str(e)}")
+                    else:
+                        # Invalid structured response, add error for the retry
+                        messages.append(types.Message(
+                            role="assistant",
+                            message=f"Returned an invalid response: {e.raw_output}.\n Must be one of the types specified."
+                        ))
+                        if retry == max_retries - 1:
+                            return (True, f"Agent failed to return valid response after {max_retries} attempts")
+                except Exception as e:
+                    return (True, f"Error calling agent: {str(e)}")
+        finally:
+            del messages[history_len:]
 
         if response is None:
             return (True, "Agent failed to return a response")
@@ -187,18 +211,23 @@ class AgentRuntime:
         # Check if agent wants to reply
         if isinstance(response, (types.ReplyToUser, types.ReplyWithCode)):
             # Stream response if streaming callback is available
-            if self.callbacks.on_response_chunk:
+            if on_response_chunk := self.callbacks.on_response_chunk:
                 # Character-by-character streaming for real-time experience
-                import asyncio
                 response_text = response.message
 
-                for i, char in enumerate(response_text):
-                    await self.callbacks.on_response_chunk(char)
-                    # Add small delay for realistic typing speed (20ms per character)
-                    await asyncio.sleep(0.02)
-            elif self.callbacks.on_agent_reply:
+                try:
+                    for i, char in enumerate(response_text):
+                        await on_response_chunk(char)
+                        # Add small delay for realistic typing speed (20ms per character)
+                        await asyncio.sleep(0.02)
+                finally:
+                    # Also on cancellation or a failing chunk callback, so the
+                    # handler can flush and release what it holds
+                    if on_response_end := self.callbacks.on_response_end:
+                        await on_response_end()
+            elif on_agent_reply := self.callbacks.on_agent_reply:
                 # Fallback to regular reply callback
-                await self.callbacks.on_agent_reply(response.message)
+                await on_agent_reply(response.message)
 
             # Store the full structured response for magic command access
             self.state.last_response = response
@@ -212,8 +241,8 @@ class AgentRuntime:
                 return (True, "Agent execution interrupted by user")
 
             # Notify UI
-            if self.callbacks.on_tool_start:
-                await self.callbacks.on_tool_start(
+            if on_tool_start := self.callbacks.on_tool_start:
+                await on_tool_start(
                     response.action,
                     response.model_dump(exclude={'action'}),
                     1,
@@ -221,8 +250,8 @@ class AgentRuntime:
                     depth
                 )
 
-            if self.callbacks.on_status_update:
-                await self.callbacks.on_status_update(
+            if on_status_update := self.callbacks.on_status_update:
+                await on_status_update(
                     f"Executing {response.action}...",
                     self.state.current_iteration
                 )
@@ -231,8 +260,8 @@ class AgentRuntime:
             result = await self.execute_tool(response, depth)
 
             # Notify UI
-            if self.callbacks.on_tool_result:
-                await self.callbacks.on_tool_result(result, depth)
+            if on_tool_result := self.callbacks.on_tool_result:
+                await on_tool_result(result, depth)
 
             # Add tool call with full parameters as assistant message
             tool_params = response.model_dump()
@@ -240,10 +269,10 @@ class AgentRuntime:
             for key, value in tool_params.items():
                 if key != 'action' and value is not None:
                     tool_call_str += f"  {key}: {value}\n"
-            self.state.messages.append(types.Message(role="assistant", message=tool_call_str))
+            self.state.add_message(types.Message(role="assistant", message=tool_call_str))
 
             # Add tool result as assistant message
-            self.state.messages.append(types.Message(role="assistant", message=result))
+            self.state.add_message(types.Message(role="assistant", message=result))
 
             return (False, None)  # Continue iterating
 
@@ -255,7 +284,9 @@ class AgentRuntime:
         """Run the full agent loop until completion"""
         # Add user message (only at depth 0, sub-agents have their own contexts)
         if depth == 0:
-            self.state.messages.append(types.Message(role="user", message=user_message))
+            # An interrupt only applies to the run it was requested for
+            self.state.interrupt_requested = False
+            self.state.add_message(types.Message(role="user", message=user_message))
 
         for _ in range(max_iterations):
             is_complete, result = await self.run_iteration(depth)
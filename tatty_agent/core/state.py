@@ -1,13 +1,17 @@
 """
 Agent state management and callback definitions
 """
+import asyncio
+import functools
+import time
+from collections import deque
 from typing import Optional, Callable, Awaitable, Any
 from dataclasses import dataclass, field
 
 from ..baml_client import types
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """Shared state for agent execution"""
     messages: list[types.Message] = field(default_factory=list)
@@ -17,9 +21,69 @@ class AgentState:
     current_depth: int = 0
     working_dir: str = "."
     last_response: Optional[Any] = field(default=None)  # Store last structured response (ReplyToUser or ReplyWithCode)
+    message_window: Optional[int] = None  # Keep only this many recent messages (None keeps all)
 
+    def add_message(self, message: types.Message) -> None:
+        """Append a message to the history, dropping the oldest beyond message_window"""
+        self.messages.append(message)
+        if self.message_window is not None and len(self.messages) > self.message_window:
+            del self.messages[:len(self.messages) - self.message_window]
 
-@dataclass
+    def set_window(self, k: Optional[int]) -> None:
+        """
+        Limit the history to the k most recent messages, trimming it now.
+
+        The list is trimmed in place, so references held by callers stay valid.
+
+        Args:
+            k: Number of messages to keep, or None for an unbounded history
+        """
+        self.message_window = k
+        if k is not None and len(self.messages) > k:
+            del self.messages[:len(self.messages) - k]
+
+
+# Free list of released AgentStates, reused by acquire_state()
+_STATE_POOL: list[AgentState] = []
+_STATE_POOL_MAX = 8
+
+
+def acquire_state(working_dir: str = ".") -> AgentState:
+    """
+    Get a clean AgentState, reusing a released one when available.
+
+    For short-lived states (e.g. one per notebook query); hand them back with
+    release_state() once nothing refers to them any more.
+    """
+    if _STATE_POOL:
+        state = _STATE_POOL.pop()
+        state.working_dir = working_dir
+        # The runtime may still point at a released state; drop any late interrupt
+        state.interrupt_requested = False
+        return state
+    return AgentState(working_dir=working_dir)
+
+
+def release_state(state: AgentState) -> None:
+    """
+    Reset a state and return it to the pool used by acquire_state().
+
+    The message and todo lists are cleared in place, so they must not be
+    shared with another state.
+    """
+    state.messages.clear()
+    state.todos.clear()
+    state.interrupt_requested = False
+    state.current_iteration = 0
+    state.current_depth = 0
+    state.working_dir = "."
+    state.last_response = None
+    state.message_window = None
+    if len(_STATE_POOL) < _STATE_POOL_MAX:
+        _STATE_POOL.append(state)
+
+
+@dataclass(slots=True)
 class AgentCallbacks:
     """Callbacks for UI updates during agent execution"""
     on_iteration: Optional[Callable[[int, int], Awaitable[None]]] = None  # (iteration, depth)
@@ -32,18 +96,48 @@ class AgentCallbacks:
 
     # Streaming callbacks for real-time chat experience
     on_response_chunk: Optional[Callable[[str], Awaitable[None]]] = None  # (chunk) - Stream response text character by character
+    on_response_end: Optional[Callable[[], Awaitable[None]]] = None  # () - Response text fully streamed
     on_thinking_start: Optional[Callable[[], Awaitable[None]]] = None  # () - Agent starts thinking
     on_thinking_update: Optional[Callable[[str], Awaitable[None]]] = None  # (status) - Update thinking status
 
 
+@functools.lru_cache(maxsize=256)
+def _iteration_label(iteration: int) -> str:
+    """Thinking status shown for an agent iteration"""
+    return f"🔄 Iteration {iteration}"
+
+
+@functools.lru_cache(maxsize=512)
+def _status_label(status: str, iteration: int) -> str:
+    """Thinking status shown for a status update"""
+    return f"{status} (iteration {iteration})"
+
+
 class StreamingCallbacks(AgentCallbacks):
     """
     Streaming-aware callbacks implementation for real-time chat widgets.
 
     This class connects agent execution events directly to chat UI updates,
     enabling character-by-character streaming and visible tool execution.
+
+    Response chunks are coalesced: they are queued without awaiting, and a
+    single flusher task sends whatever arrived within _FLUSH_INTERVAL as one
+    update. Thinking status updates skip
+    repeats and go out at most once per _STATUS_INTERVAL, always ending on
+    the most recent status.
     """
 
+    __slots__ = (
+        'stream', 'message_id', '_ring', '_chunk_event', '_send_lock', '_flusher',
+        '_last_status', '_last_status_ts', '_pending_status', '_status_task'
+    )
+
+    # Seconds response chunks are buffered before being sent as one update
+    _FLUSH_INTERVAL = 0.02
+
+    # Minimum seconds between two thinking status updates
+    _STATUS_INTERVAL = 0.05
+
     def __init__(self, stream_handler, message_id: str):
         """
         Initialize streaming callbacks.
@@ -52,26 +146,34 @@ class StreamingCallbacks(AgentCallbacks):
             stream_handler: StreamingChatResponse instance for UI updates
             message_id: Unique ID for the chat message being processed
         """
-        super().__init__()
         self.stream = stream_handler
         self.message_id = message_id
+        self._ring: deque[str] = deque()
+        self._chunk_event = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._last_status: Optional[str] = None
+        self._last_status_ts = float("-inf")
+        self._pending_status: Optional[str] = None
+        self._status_task: Optional[asyncio.Task] = None
 
-        # Wire up streaming callbacks
-        self.on_thinking_start = self._on_thinking_start
-        self.on_thinking_update = self._on_thinking_update
-        self.on_tool_start = self._on_tool_start
-        self.on_tool_result = self._on_tool_result
-        self.on_response_chunk = self._on_response_chunk
-        self.on_iteration = self._on_iteration
-        self.on_status_update = self._on_status_update
-
-    async def _on_thinking_start(self):
-        """Agent starts thinking - show initial thinking bubble"""
-        await self.stream.start_thinking_message(self.message_id)
+        # Wire up streaming callbacks. Thinking start needs nothing but the
+        # message id, so the handler's coroutine is bound to it directly
+        # rather than going through a forwarding method.
+        super().__init__(
+            on_thinking_start=functools.partial(stream_handler.start_thinking_message, message_id),
+            on_thinking_update=self._on_thinking_update,
+            on_tool_start=self._on_tool_start,
+            on_tool_result=self._on_tool_result,
+            on_response_chunk=self._on_response_chunk,
+            on_response_end=self.aclose,
+            on_iteration=self._on_iteration,
+            on_status_update=self._on_status_update
+        )
 
     async def _on_thinking_update(self, status: str):
         """Update thinking status display"""
-        await self.stream.update_thinking_status(status, self.message_id)
+        await self._update_status(status)
 
     async def _on_tool_start(self, tool_name: str, params: dict, tool_idx: int, total_tools: int, depth: int):
         """Tool execution starts - show in chat flow"""
@@ -82,13 +184,75 @@ class StreamingCallbacks(AgentCallbacks):
         await self.stream.update_tool_result(result, self.message_id)
 
     async def _on_response_chunk(self, chunk: str):
-        """Stream response text character by character"""
-        await self.stream.stream_response_chunk(chunk, self.message_id)
+        """Queue response text for the flusher task; never waits on the UI"""
+        self._ring.append(chunk)
+        self._chunk_event.set()
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await self._chunk_event.wait()
+            # Let chunks accumulate for one interval, then send them together
+            await asyncio.sleep(self._FLUSH_INTERVAL)
+            self._chunk_event.clear()
+            await self._send_buffered()
+
+    async def _send_buffered(self):
+        # The lock keeps sends from the flusher and from flush() in order
+        async with self._send_lock:
+            if not self._ring:
+                return
+            merged = "".join(self._ring)
+            self._ring.clear()
+            await self.stream.stream_response_chunk(merged, self.message_id)
+
+    async def flush(self):
+        """Send any queued response text now"""
+        await self._send_buffered()
+
+    async def aclose(self):
+        """Flush queued response text and stop the flusher and status tasks"""
+        await self.flush()
+        for task in (self._flusher, self._status_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._flusher = None
+        self._status_task = None
 
     async def _on_iteration(self, iteration: int, depth: int):
         """Agent iteration progress"""
-        await self.stream.update_thinking_status(f"🔄 Iteration {iteration}", self.message_id)
+        await self._update_status(_iteration_label(iteration))
 
     async def _on_status_update(self, status: str, iteration: int):
         """General status updates"""
-        await self.stream.update_thinking_status(f"{status} (iteration {iteration})", self.message_id)
\ No newline at end of file
+        await self._update_status(_status_label(status, iteration))
+
+    async def _update_status(self, status: str):
+        """Show a thinking status, dropping repeats and rate limiting the UI"""
+        self._pending_status = status
+        if self._status_task is not None and not self._status_task.done():
+            # The scheduled update will pick up this status
+            return
+        wait = self._last_status_ts + self._STATUS_INTERVAL - time.monotonic()
+        if wait > 0:
+            self._status_task = asyncio.create_task(self._send_status_later(wait))
+        else:
+            await self._send_status()
+
+    async def _send_status_later(self, delay: float):
+        await asyncio.sleep(delay)
+        await self._send_status()
+
+    async def _send_status(self):
+        status = self._pending_status
+        if status == self._last_status:
+            return
+        self._last_status = status
+        self._last_status_ts = time.monotonic()
+        await self.stream.update_thinking_status(status, self.message_id)
\ No newline at end of file
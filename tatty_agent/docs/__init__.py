@@ -18,75 +18,102 @@ docs_path = get_docs_dir()
 ```
 """
 
+import codecs
+import functools
+import os
+import sys
 from pathlib import Path
 from typing import Optional
 
+# Characters of a document shown by show_readme/show_distribution_guide
+_PREVIEW_CHARS = 1000
+
+@functools.cache
 def get_docs_dir() -> Path:
     """Get the documentation directory path"""
     return Path(__file__).parent
 
+@functools.lru_cache(maxsize=64)
 def get_doc_path(name: str) -> Optional[Path]:
     """
     Get path to a specific documentation file.
 
+    Lookups are cached, as the docs ship with the package; call
+    refresh_docs_cache() after adding or removing files.
+
     Args:
         name: Name of the documentation file
 
     Returns:
         Path to the documentation file, or None if not found
     """
-    docs_dir = get_docs_dir()
-    doc_path = docs_dir / name
+    doc_path = os.path.join(get_docs_dir(), name)
 
-    if doc_path.exists():
-        return doc_path
+    # A Path is only built for a hit
+    if os.path.isfile(doc_path):
+        return Path(doc_path)
     return None
 
-def read_doc(name: str) -> Optional[str]:
+def read_doc(name: str, max_bytes: Optional[int] = None) -> Optional[str]:
     """
     Read content of a documentation file.
 
     Args:
         name: Name of the documentation file
+        max_bytes: Read at most this many bytes from the start of the file
 
     Returns:
         Content of the file, or None if not found
     """
     doc_path = get_doc_path(name)
     if doc_path:
-        return doc_path.read_text()
+        with doc_path.open("rb") as f:
+            data = f.read(max_bytes) if max_bytes else f.read()
+        # A capped read may end inside a multi-byte character; the incremental
+        # decoder drops the partial sequence instead of replacing it
+        final = not max_bytes or len(data) < max_bytes
+        return codecs.getincrementaldecoder("utf-8")(errors="replace").decode(data, final=final)
     return None
 
+def _show_preview(name: str, title: str, footer: str):
+    """Print a doc's first _PREVIEW_CHARS characters between a title and its path"""
+    # Enough bytes for one character past the preview, however wide they are
+    content = read_doc(name, max_bytes=4 * (_PREVIEW_CHARS + 1))
+    if not content:
+        print(f"❌ {name} not found")
+        return
+
+    body = content[:_PREVIEW_CHARS] + "..." if len(content) > _PREVIEW_CHARS else content
+    # One write for the whole preview
+    sys.stdout.write(f"{title}\n{'=' * 50}\n{body}\n\n{footer}\n   {get_doc_path(name)}\n")
+
 def show_readme():
     """Display the main README documentation"""
-    readme_content = read_doc("README.md")
-    if readme_content:
-        print("📚 TATty Agent - README")
-        print("=" * 50)
-        print(readme_content[:1000] + "..." if len(readme_content) > 1000 else readme_content)
-        print()
-        print("💡 For full documentation, see:")
-        print(f"   {get_doc_path('README.md')}")
-    else:
-        print("❌ README.md not found")
+    _show_preview("README.md", "📚 TATty Agent - README", "💡 For full documentation, see:")
 
 def show_distribution_guide():
     """Display the distribution guide"""
-    dist_content = read_doc("DISTRIBUTION.md")
-    if dist_content:
-        print("📦 Distribution Guide")
-        print("=" * 50)
-        print(dist_content[:1000] + "..." if len(dist_content) > 1000 else dist_content)
-        print()
-        print("💡 For full guide, see:")
-        print(f"   {get_doc_path('DISTRIBUTION.md')}")
-    else:
-        print("❌ DISTRIBUTION.md not found")
+    _show_preview("DISTRIBUTION.md", "📦 Distribution Guide", "💡 For full guide, see:")
+
+@functools.lru_cache(maxsize=1)
+def _list_docs(docs_dir: Path, mtime_ns: int) -> tuple:
+    """Documentation file names; the directory mtime keys the cache"""
+    # Hidden files are skipped, as glob("*") did
+    with os.scandir(docs_dir) as entries:
+        return tuple(
+            entry.name for entry in entries
+            if not entry.name.startswith(".") and entry.name != "__init__.py" and entry.is_file()
+        )
 
 def list_docs() -> list:
     """List all available documentation files"""
     docs_dir = get_docs_dir()
-    return [f.name for f in docs_dir.glob("*") if f.is_file() and f.name != "__init__.py"]
+    return list(_list_docs(docs_dir, docs_dir.stat().st_mtime_ns))
+
+def refresh_docs_cache():
+    """Forget cached documentation lookups"""
+    get_doc_path.cache_clear()
+    _list_docs.cache_clear()
 
 __all__ = [
     'get_docs_dir',
@@ -94,5 +121,6 @@ __all__ = [
     'read_doc',
     'show_readme',
     'show_distribution_guide',
-    'list_docs'
+    'list_docs',
+    'refresh_docs_cache'
 ]
\ No newline at end of file
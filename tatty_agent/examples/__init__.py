@@ -37,27 +37,50 @@ tatty_agent.examples.show_jupyter_demo()
 ```
 """
 
+import asyncio
+import functools
 import os
+import shutil
 from pathlib import Path
 from typing import List, Optional
 
+@functools.cache
 def get_examples_dir() -> Path:
     """Get the examples directory path"""
     return Path(__file__).parent
 
-def list_examples() -> List[str]:
-    """List all available example files"""
-    examples_dir = get_examples_dir()
-    examples = []
-
-    for file in examples_dir.glob("*.ipynb"):
-        examples.append(file.stem)
+@functools.lru_cache(maxsize=1)
+def _scan_examples(examples_dir: Path, mtime_ns: int) -> tuple:
+    """
+    Sorted example names and a name -> path map; the directory mtime keys the cache.
 
-    for file in examples_dir.glob("*.py"):
-        if file.name != "__init__.py":
-            examples.append(file.stem)
+    One scandir pass serves both list_examples() and get_example_notebook().
+    """
+    names = []
+    paths = {}
+
+    # Hidden files are skipped, as glob did
+    with os.scandir(examples_dir) as entries:
+        for entry in entries:
+            stem, ext = os.path.splitext(entry.name)
+            if entry.name.startswith(".") or ext not in (".ipynb", ".py") or entry.name == "__init__.py":
+                continue
+            if not entry.is_file():
+                continue
+            names.append(stem)
+            # A notebook takes precedence over a script of the same name
+            if ext == ".ipynb" or stem not in paths:
+                paths[stem] = Path(entry.path)
+
+    return tuple(sorted(names)), paths
+
+def _examples() -> tuple:
+    examples_dir = get_examples_dir()
+    return _scan_examples(examples_dir, examples_dir.stat().st_mtime_ns)
 
-    return sorted(examples)
+def list_examples() -> List[str]:
+    """List all available example files"""
+    return list(_examples()[0])
 
 def get_example_notebook(name: str) -> Optional[Path]:
     """
@@ -69,19 +92,8 @@ def get_example_notebook(name: str) -> Optional[Path]:
     Returns:
         Path to the example file, or None if not found
     """
-    examples_dir = get_examples_dir()
-
-    # Try .ipynb first
-    notebook_path = examples_dir / f"{name}.ipynb"
-    if notebook_path.exists():
-        return notebook_path
-
-    # Try .py
-    py_path = examples_dir / f"{name}.py"
-    if py_path.exists():
-        return py_path
-
-    return None
+    # .ipynb is preferred over .py
+    return _examples()[1].get(name)
 
 def show_hello_world():
     """Display information about the Hello World notebook"""
@@ -127,6 +139,18 @@ def show_jupyter_demo():
         print("❌ Jupyter demo notebook not found")
         return None
 
+def _copy_target(name: str, destination: str) -> Optional[tuple]:
+    """Resolve an example and its destination path, creating the directory"""
+    source = get_example_notebook(name)
+    if not source:
+        print(f"❌ Example '{name}' not found")
+        return None
+
+    dest_dir = Path(destination)
+    dest_dir.mkdir(exist_ok=True)
+
+    return source, dest_dir / source.name
+
 def copy_example(name: str, destination: str = ".") -> Optional[Path]:
     """
     Copy an example to a destination directory.
@@ -138,27 +162,45 @@ def copy_example(name: str, destination: str = ".") -> Optional[Path]:
     Returns:
         Path to the copied file, or None if source not found
     """
-    import shutil
-
-    source = get_example_notebook(name)
-    if not source:
-        print(f"❌ Example '{name}' not found")
+    target = _copy_target(name, destination)
+    if not target:
         return None
+    source, dest_path = target
 
-    dest_dir = Path(destination)
-    dest_dir.mkdir(exist_ok=True)
-
-    dest_path = dest_dir / source.name
     shutil.copy2(source, dest_path)
 
     print(f"✅ Copied {source.name} to {dest_path}")
     return dest_path
 
+async def copy_example_async(name: str, destination: str = ".") -> Optional[Path]:
+    """
+    Copy an example to a destination directory without blocking the event loop.
+
+    Same as copy_example(), with the file copy run in a worker thread.
+
+    Args:
+        name: Name of the example to copy
+        destination: Destination directory (default: current directory)
+
+    Returns:
+        Path to the copied file, or None if source not found
+    """
+    target = _copy_target(name, destination)
+    if not target:
+        return None
+    source, dest_path = target
+
+    await asyncio.to_thread(shutil.copy2, source, dest_path)
+
+    print(f"✅ Copied {source.name} to {dest_path}")
+    return dest_path
+
 __all__ = [
     'get_examples_dir',
     'list_examples',
     'get_example_notebook',
     'show_hello_world',
     'show_jupyter_demo',
-    'copy_example'
+    'copy_example',
+    'copy_example_async'
 ]
\ No newline at end of file
@@ -60,91 +60,120 @@ with track_tool_execution("MyTool", {"param": "value"}):
 - **progress**: Real-time progress indicators and execution tracking
 """
 
-# Import all public components
-from .display import (
-    TattyDisplayFormatter,
-    display_agent_response,
-    display_tool_execution,
-    display_progress_indicator,
-    display_conversation_history,
-    display_artifact_links
-)
-
-from .notebook import (
-    NotebookContextManager,
-    get_notebook_context,
-    get_notebook_variables,
-    execute_in_notebook,
-    create_cell_with_code
-)
-
-from .progress import (
-    ToolExecutionProgressTracker,
-    LiveExecutionDisplay,
-    get_live_display,
-    track_tool_execution,
-    display_execution_summary,
-    create_interactive_execution_widget
-)
-
-# Magic commands are imported separately when needed
-from . import magic
+import importlib
+import os
+import sys
 
-__all__ = [
+# Public names and the submodule each one lives in. Submodules (and with them
+# IPython, ipywidgets and the HTML formatters) are imported on first access.
+_LAZY = {
     # Display components
-    'TattyDisplayFormatter',
-    'display_agent_response',
-    'display_tool_execution',
-    'display_progress_indicator',
-    'display_conversation_history',
-    'display_artifact_links',
+    'TattyDisplayFormatter': '.display',
+    'display_agent_response': '.display',
+    'display_tool_execution': '.display',
+    'display_progress_indicator': '.display',
+    'display_conversation_history': '.display',
+    'display_artifact_links': '.display',
 
     # Notebook integration
-    'NotebookContextManager',
-    'get_notebook_context',
-    'get_notebook_variables',
-    'execute_in_notebook',
-    'create_cell_with_code',
+    'NotebookContextManager': '.notebook',
+    'get_notebook_context': '.notebook',
+    'get_notebook_variables': '.notebook',
+    'execute_in_notebook': '.notebook',
+    'create_cell_with_code': '.notebook',
 
     # Progress tracking
-    'ToolExecutionProgressTracker',
-    'LiveExecutionDisplay',
-    'get_live_display',
-    'track_tool_execution',
-    'display_execution_summary',
-    'create_interactive_execution_widget',
+    'ToolExecutionProgressTracker': '.progress',
+    'LiveExecutionDisplay': '.progress',
+    'get_live_display': '.progress',
+    'track_tool_execution': '.progress',
+    'display_execution_summary': '.progress',
+    'create_interactive_execution_widget': '.progress',
 
     # Magic commands module (for %load_ext)
-    'magic'
-]
-
-# Auto-detection and helpful messages
-try:
-    from IPython import get_ipython
-    from IPython.display import display, HTML
-
-    ipython = get_ipython()
-    if ipython is not None:
-        # We're in an IPython/Jupyter environment
-
-        # Check if magic commands are already loaded
-        if 'tatty' not in ipython.magics_manager.magics['line_cell']:
-            print("💡 TIP: Load TATty magic commands with: %load_ext tatty_agent.jupyter.magic")
-
-        # Provide quick start info
-        print("🎉 TATty Agent Jupyter Integration Available!")
-        print("🎯 Magic Commands (Primary Interface):")
-        print("  %load_ext tatty_agent.jupyter.magic")
-        print("  %tatty \"your query here\"")
-        print("  %%tatty")
-        print("  multi-line query here")
-        print()
-        print("💡 TIP: Magic commands provide the most reliable TATty Agent experience!")
-
-except ImportError:
-    # Not in Jupyter environment
-    print("ℹ️  TATty Agent Jupyter integration loaded (use in Jupyter notebooks)")
-
-except Exception:
-    # Silent fallback
-    pass
\ No newline at end of file
+    'magic': '.magic'
+}
+
+__all__ = list(_LAZY) + ['welcome_banner']
+
+_announced = False
+
+# The IPython shell found by _maybe_announce, if any
+_ipython = None
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        _maybe_announce()
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = module if name == 'magic' else getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def welcome_banner():
+    """Print the quick start info for the TATty magic commands"""
+    ipython = _ipython
+    if ipython is None:
+        try:
+            from IPython import get_ipython
+            ipython = get_ipython()
+        except ImportError:
+            pass
+
+    lines = []
+    # Check if magic commands are already loaded
+    if ipython is None or ipython.find_line_magic('tatty') is None:
+        lines.append("💡 TIP: Load TATty magic commands with: %load_ext tatty_agent.jupyter.magic")
+
+    lines += [
+        "🎉 TATty Agent Jupyter Integration Available!",
+        "🎯 Magic Commands (Primary Interface):",
+        "  %load_ext tatty_agent.jupyter.magic",
+        "  %tatty \"your query here\"",
+        "  %%tatty",
+        "  multi-line query here",
+        "",
+        "💡 TIP: Magic commands provide the most reliable TATty Agent experience!"
+    ]
+    # One write for the whole banner
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _maybe_announce():
+    """Show the welcome banner, once, on first use of the integration"""
+    global _announced, _ipython
+    if _announced:
+        return
+    _announced = True
+
+    # TATTY_BANNER=0 turns the banner off
+    if os.environ.get("TATTY_BANNER", "1") != "1":
+        return
+
+    # Keep piped or redirected output clean; Jupyter kernels are not TTYs
+    # but run with JPY_PARENT_PID set
+    if not (sys.stdout and sys.stdout.isatty()) and not os.environ.get("JPY_PARENT_PID"):
+        return
+
+    # Auto-detection and helpful messages
+    try:
+        from IPython import get_ipython
+
+        _ipython = get_ipython()
+        if _ipython is not None:
+            # We're in an IPython/Jupyter environment
+            welcome_banner()
+
+    except ImportError:
+        # Not in Jupyter environment
+        print("ℹ️  TATty Agent Jupyter integration loaded (use in Jupyter notebooks)")
+
+    except Exception:
+        # Silent fallback
+        pass
@@ -7,6 +7,10 @@ and embedded artifacts.
 """
 import json
 import base64
+import functools
+import html
+import re
+import secrets
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
@@ -34,19 +38,9 @@ except ImportError:
         return content
 
 
-class TattyDisplayFormatter:
-    """Rich display formatter for TATty Agent results in Jupyter"""
-
-    def __init__(self, theme: str = "default"):
-        self.theme = theme
-        self._custom_css_loaded = False
-
-    def _load_custom_css(self):
-        """Load custom CSS for TATty Agent displays"""
-        if not JUPYTER_AVAILABLE or self._custom_css_loaded:
-            return
-
-        css = """
+# Stylesheet for all TATty Agent displays, built once and shown by each
+# formatter before its first output
+_CSS_STYLE_TAG = """
         <style>
         .tatty-agent-output {
             font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
@@ -204,7 +198,64 @@ class TattyDisplayFormatter:
         </style>
         """
 
-        display(HTML(css))
+_CSS_HTML = HTML(_CSS_STYLE_TAG)
+
+
+def _dom_id() -> str:
+    """Random suffix for element ids, unique per output without hashing content"""
+    return secrets.token_hex(4)
+
+
+# Observability JSON longer than this is shown without syntax highlighting
+_OBS_HIGHLIGHT_MAX_CHARS = 64 * 1024
+
+# Strings shorter than this are escaped through an LRU cache
+_ESCAPE_CACHE_MAX_LEN = 256
+
+
+def _escape_html(text: str) -> str:
+    # Same entities as the former chain of str.replace calls (&, <, >, ", ');
+    # str.translate was measured slower on text containing markup
+    return html.escape(text, quote=True)
+
+
+_escape_html_cached = functools.lru_cache(maxsize=4096)(_escape_html)
+
+
+# JSON tokens colored by _syntax_highlight_json. The text is HTML-escaped
+# beforehand, so quotes are already &quot; and string literals stay uncolored.
+_JSON_TOKEN_RE = re.compile(
+    r'(?P<number>\b\d+\.?\d*\b)'              # Numbers
+    r'|(?P<keyword>\b(?:true|false|null)\b)'  # Booleans and null
+    r'|(?P<bracket>[{}[\]])'                  # Brackets and braces
+)
+
+_JSON_TOKEN_COLORS = {
+    'number': '#fd971f',
+    'keyword': '#66d9ef',
+    'bracket': '#f92672'
+}
+
+
+def _json_token_span(match: re.Match) -> str:
+    return f'<span style="color: {_JSON_TOKEN_COLORS[match.lastgroup]};">{match.group()}</span>'
+
+
+class TattyDisplayFormatter:
+    """Rich display formatter for TATty Agent results in Jupyter"""
+
+    def __init__(self, theme: str = "default"):
+        self.theme = theme
+        self._custom_css_loaded = False
+
+    def _load_custom_css(self):
+        """Load custom CSS for TATty Agent displays"""
+        # Injected once per formatter, not per kernel: clearing the output
+        # that holds the <style> tag would leave later formatters unstyled
+        if not JUPYTER_AVAILABLE or self._custom_css_loaded:
+            return
+
+        display(_CSS_HTML)
         self._custom_css_loaded = True
 
     def display_agent_response(
@@ -279,10 +330,10 @@ class TattyDisplayFormatter:
         """Display individual tool execution with collapsible result"""
         self._load_custom_css()
 
-        tool_id = f"tool_{abs(hash(f'{tool_name}{str(params)}'))}"
         time_str = f" • {execution_time:.2f}s" if execution_time else ""
 
         params_str = ", ".join([f"{k}={v}" for k, v in params.items() if v is not None])
+        tool_id = f"tool_{_dom_id()}"
         if len(params_str) > 100:
             params_str = params_str[:97] + "..."
 
@@ -338,7 +389,7 @@ class TattyDisplayFormatter:
             display(HTML('<div style="color: #6c757d; text-align: center;">No conversation history</div>'))
             return
 
-        entries_html = ""
+        entries = []
         for i, entry in enumerate(history):
             entry_type = entry.get("type", "unknown")
             content = entry.get("content", "")
@@ -360,7 +411,7 @@ class TattyDisplayFormatter:
             entry_id = f"history_{i}"
             short_content = content[:100] + "..." if len(content) > 100 else content
 
-            entries_html += f"""
+            entries.append(f"""
             <div class="tatty-conversation-entry {css_class}">
                 <div class="tatty-message-header tatty-expandable" onclick="
                     var content = document.getElementById('{entry_id}');
@@ -378,7 +429,7 @@ class TattyDisplayFormatter:
                     {self._escape_html(short_content)}
                 </div>
             </div>
-            """
+            """)
 
         html_content = f"""
         <div class="tatty-agent-output">
@@ -386,7 +437,7 @@ class TattyDisplayFormatter:
                 <span>📚 Conversation History ({len(history)} entries)</span>
             </div>
             <div class="tatty-agent-body">
-                {entries_html}
+                {"".join(entries)}
             </div>
         </div>
         """
@@ -400,22 +451,22 @@ class TattyDisplayFormatter:
 
         self._load_custom_css()
 
-        links_html = ""
+        links = []
         for artifact in artifacts:
             name = artifact.get("name", "Unknown")
             path = artifact.get("path", "")
             type_icon = self._get_file_icon(path)
 
-            links_html += f"""
+            links.append(f"""
             <a href="files/{path}" class="tatty-artifact-link" target="_blank">
                 {type_icon} {name}
             </a>
-            """
+            """)
 
         html_content = f"""
         <div style="margin: 10px 0;">
             <strong>📁 Generated Artifacts:</strong><br>
-            {links_html}
+            {"".join(links)}
         </div>
         """
 
@@ -426,17 +477,17 @@ class TattyDisplayFormatter:
         if not tools_used:
             return ""
 
-        tools_html = ""
+        parts = []
         for tool in tools_used:
             name = tool.get("name", "Unknown")
             params = tool.get("params", {})
             result = tool.get("result", "")
             time_taken = tool.get("execution_time", 0)
 
-            tool_id = f"tool_result_{abs(hash(str(tool)))}"
             params_str = ", ".join([f"{k}={v}" for k, v in params.items() if v is not None])
+            tool_id = f"tool_result_{_dom_id()}"
 
-            tools_html += f"""
+            parts.append(f"""
             <div class="tatty-tool-execution">
                 <div class="tatty-tool-name">🛠️ {name} • {time_taken:.2f}s</div>
                 {f'<div class="tatty-tool-params">{self._escape_html(params_str)}</div>' if params_str else ''}
@@ -450,25 +501,32 @@ class TattyDisplayFormatter:
                     {self._escape_html(result)}
                 </div>
             </div>
-            """
+            """)
 
-        return tools_html
+        return "".join(parts)
 
     def _format_result_content(self, content: str) -> str:
         """Format result content with syntax highlighting for code blocks"""
         # Simple markdown-style code block detection
         if "```" in content:
-            parts = content.split("```")
-            formatted = ""
-            for i, part in enumerate(parts):
-                if i % 2 == 0:  # Regular text
-                    formatted += self._escape_html(part)
-                else:  # Code block
-                    lines = part.split('\n')
-                    language = lines[0] if lines else ""
-                    code = '\n'.join(lines[1:]) if len(lines) > 1 else part
-                    formatted += f'<div class="tatty-code-block">{self._escape_html(code)}</div>'
-            return formatted
+            # Walk the fences in one pass; text between them alternates
+            # between prose and code, starting with prose
+            formatted = []
+            in_code = False
+            pos = 0
+            while True:
+                fence = content.find("```", pos)
+                segment = content[pos:] if fence < 0 else content[pos:fence]
+                if not in_code:  # Regular text
+                    formatted.append(self._escape_html(segment))
+                else:  # Code block; the first line names the language
+                    newline = segment.find("\n")
+                    code = segment[newline + 1:] if newline >= 0 else segment
+                    formatted.append(f'<div class="tatty-code-block">{self._escape_html(code)}</div>')
+                if fence < 0:
+                    return "".join(formatted)
+                pos = fence + 3
+                in_code = not in_code
         else:
             return self._escape_html(content).replace('\n', '<br>')
 
@@ -477,8 +535,16 @@ class TattyDisplayFormatter:
         import json
 
         obs_json = json.dumps(observability_data, indent=2, default=str)
-        obs_id = f"obs_data_{abs(hash(obs_json))}"
-        copy_id = f"copy_btn_{abs(hash(obs_json))}"
+        # Large blobs are shown as plain escaped text; the panel starts hidden
+        # and coloring hundreds of KB would hold up the cell for nothing
+        if len(obs_json) > _OBS_HIGHLIGHT_MAX_CHARS:
+            obs_body = self._escape_html(obs_json)
+        else:
+            obs_body = self._syntax_highlight_json(obs_json)
+        obs_token = _dom_id()
+        obs_id = f"obs_data_{obs_token}"
+        copy_id = f"copy_btn_{obs_token}"
+        copy_fn = f"copyObservabilityData_{obs_token}"
 
         # Extract key metrics for display
         total_duration = observability_data.get('total_duration', 0)
@@ -506,7 +572,7 @@ class TattyDisplayFormatter:
                     flex: 1;
                 ">📊 Show Observability JSON (1 task: {steps_count} steps, {total_tokens_in + total_tokens_out:.0f} tokens, {total_duration:.1f}s)</button>
 
-                <button id="{copy_id}" onclick="copyObservabilityData_{abs(hash(obs_json))}()" style="
+                <button id="{copy_id}" onclick="{copy_fn}()" style="
                     background: #f5f5f5;
                     border: 1px solid #ddd;
                     padding: 6px 12px;
@@ -533,11 +599,11 @@ class TattyDisplayFormatter:
                 overflow-y: auto;
                 line-height: 1.5;
                 box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
-            ">{self._syntax_highlight_json(obs_json)}</div>
+            ">{obs_body}</div>
         </div>
 
         <script>
-            function copyObservabilityData_{abs(hash(obs_json))}() {{
+            function {copy_fn}() {{
                 var jsonData = {repr(obs_json)};
                 navigator.clipboard.writeText(jsonData).then(() => {{
                     var btn = document.getElementById('{copy_id}');
@@ -563,7 +629,7 @@ class TattyDisplayFormatter:
 
     def _display_raw_text_toggle(self, text: str):
         """Display a collapsible raw text section for copy-paste"""
-        text_id = f"raw_text_{abs(hash(text))}"
+        text_id = f"raw_text_{_dom_id()}"
 
         html_content = f"""
         <div style="margin-top: 10px;">
@@ -600,34 +666,16 @@ class TattyDisplayFormatter:
 
     def _syntax_highlight_json(self, json_text: str) -> str:
         """Apply basic syntax highlighting to JSON text"""
-        import re
-
-        # Escape HTML first
-        highlighted = self._escape_html(json_text)
-
-        # Apply syntax highlighting with colors
-        # Strings (keys and values)
-        highlighted = re.sub(r'"([^"]*)":', r'<span style="color: #66d9ef;">&quot;\1&quot;</span>:', highlighted)
-        highlighted = re.sub(r': "([^"]*)"', r': <span style="color: #a6e22e;">&quot;\1&quot;</span>', highlighted)
-
-        # Numbers
-        highlighted = re.sub(r'\b(\d+\.?\d*)\b', r'<span style="color: #fd971f;">\1</span>', highlighted)
-
-        # Booleans and null
-        highlighted = re.sub(r'\b(true|false|null)\b', r'<span style="color: #66d9ef;">\1</span>', highlighted)
-
-        # Brackets and braces
-        highlighted = re.sub(r'([{}[\]])', r'<span style="color: #f92672;">\1</span>', highlighted)
-
-        return highlighted
+        # Escape HTML first, then color every token in a single pass
+        return _JSON_TOKEN_RE.sub(_json_token_span, self._escape_html(json_text))
 
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters"""
-        return (text.replace("&", "&amp;")
-                   .replace("<", "&lt;")
-                   .replace(">", "&gt;")
-                   .replace('"', "&quot;")
-                   .replace("'", "&#x27;"))
+        # Short strings (tool names, parameters, previews) repeat a lot across
+        # a session; long results are escaped directly to keep the cache small
+        if len(text) < _ESCAPE_CACHE_MAX_LEN:
+            return _escape_html_cached(text)
+        return _escape_html(text)
 
     def _get_file_icon(self, path: str) -> str:
         """Get appropriate icon for file type"""
@@ -66,13 +66,39 @@ except ImportError:
 
 
 from ..core.runtime import AgentRuntime
-from ..core.state import AgentState, AgentCallbacks
+from ..core.state import AgentState, AgentCallbacks, acquire_state, release_state
 from ..core.types import Message
 from ..config import load_config
 from .display import display_agent_response, display_progress_indicator, display_tool_execution
 from .notebook import NotebookContextManager
 
 
+# Human-readable description of a tool call, shown as the notebook runs tools;
+# built once rather than on every tool start
+_TOOL_REASONS = {
+    'Dependency': lambda p: f"check if {', '.join(p.get('packages', ['packages']))} are available" if p.get('check_type') == 'imports' else 'check dependencies',
+    'Read': lambda p: f"read file {p.get('file_path', 'unknown')}" if p.get('file_path') else 'read a file',
+    'Write': lambda p: f"write to {p.get('file_path', 'a file')}" if p.get('file_path') else 'write a file',
+    'Edit': lambda p: f"edit {p.get('file_path', 'a file')}" if p.get('file_path') else 'edit a file',
+    'Bash': lambda p: f"run command: {p.get('command', 'unknown')[:50]}{'...' if len(p.get('command', '')) > 50 else ''}" if p.get('command') else 'run a command',
+    'Glob': lambda p: f"find files matching '{p.get('pattern', 'unknown')}'" if p.get('pattern') else 'find files',
+    'Grep': lambda p: f"search for '{p.get('pattern', 'unknown')}' in files" if p.get('pattern') else 'search files',
+    'WebFetch': lambda p: f"fetch content from {p.get('url', 'unknown URL')}" if p.get('url') else 'fetch web content',
+    'WebSearch': lambda p: f"search the web for '{p.get('query', 'unknown')}'" if p.get('query') else 'search the web',
+    'TodoWrite': lambda p: 'update task list',
+    'TodoRead': lambda p: 'check current tasks',
+    'NotebookEdit': lambda p: f"edit notebook cell {p.get('cell_number', 'unknown')}" if 'cell_number' in p else 'edit notebook cell',
+    'InstallPackages': lambda p: f"install packages: {', '.join(p.get('packages', ['unknown']))}" if p.get('packages') else 'install packages',
+    'ArtifactManagement': lambda p: f"{p.get('action_type', 'manage')} artifacts" if p.get('action_type') else 'manage artifacts',
+    'Agent': lambda p: f"delegate task: {p.get('description', 'unknown task')}" if p.get('description') else 'delegate to sub-agent'
+}
+
+
+class NotebookCallbacks(AgentCallbacks):
+    """AgentCallbacks that also record the tools executed, for the result display"""
+    __slots__ = ('_tools_executed', '_last_tool_info')
+
+
 class ErrorHandlingConfig:
     """Configuration for enhanced error handling behavior"""
 
@@ -253,15 +279,18 @@ class TattyMagics(Magics):
         # Show progress indicator
         display_progress_indicator(f"Processing query: {query[:50]}...")
 
+        # Per-query state, taken from and returned to the shared pool
+        state = None
+
         try:
             # Create agent state with smart context management
             if fresh or not self.notebook_context:
                 # Start with fresh state
-                state = AgentState(working_dir=working_dir)
+                state = acquire_state(working_dir)
             else:
                 # Use limited conversation history for better focus
                 full_state = self.notebook_context.get_persistent_agent_state(working_dir)
-                state = AgentState(working_dir=working_dir)
+                state = acquire_state(working_dir)
 
                 # Keep only recent relevant messages (limit conversation history)
                 if full_state.messages and history_limit > 0:
@@ -416,6 +445,9 @@ class TattyMagics(Magics):
                 import traceback
                 traceback.print_exc()
             return f"Error: {str(e)}"
+        finally:
+            if state is not None:
+                release_state(state)
 
     async def _handle_code_generation(self, query: str, intent_result, state: AgentState, working_dir: str, verbose: bool, observability: dict):
         """Handle executable_code intent - try AgentDispatcher first, fall back to full loop if needed"""
@@ -698,7 +730,7 @@ class TattyMagics(Magics):
 
     def _create_notebook_callbacks(self, verbose: bool = False) -> AgentCallbacks:
         """Create callbacks for notebook display"""
-        callbacks = AgentCallbacks()
+        callbacks = NotebookCallbacks()
 
         # Track executed tools for display
         callbacks._tools_executed = []
@@ -804,31 +836,13 @@ class TattyMagics(Magics):
 
     def _get_tool_reason(self, tool_name: str, params: dict) -> str:
         """Get a human-readable reason for why a tool was used"""
-        tool_reasons = {
-            'Dependency': lambda p: f"check if {', '.join(p.get('packages', ['packages']))} are available" if p.get('check_type') == 'imports' else 'check dependencies',
-            'Read': lambda p: f"read file {p.get('file_path', 'unknown')}" if p.get('file_path') else 'read a file',
-            'Write': lambda p: f"write to {p.get('file_path', 'a file')}" if p.get('file_path') else 'write a file',
-            'Edit': lambda p: f"edit {p.get('file_path', 'a file')}" if p.get('file_path') else 'edit a file',
-            'Bash': lambda p: f"run command: {p.get('command', 'unknown')[:50]}{'...' if len(p.get('command', '')) > 50 else ''}" if p.get('command') else 'run a command',
-            'Glob': lambda p: f"find files matching '{p.get('pattern', 'unknown')}'" if p.get('pattern') else 'find files',
-            'Grep': lambda p: f"search for '{p.get('pattern', 'unknown')}' in files" if p.get('pattern') else 'search files',
-            'WebFetch': lambda p: f"fetch content from {p.get('url', 'unknown URL')}" if p.get('url') else 'fetch web content',
-            'WebSearch': lambda p: f"search the web for '{p.get('query', 'unknown')}'" if p.get('query') else 'search the web',
-            'TodoWrite': lambda p: 'update task list',
-            'TodoRead': lambda p: 'check current tasks',
-            'NotebookEdit': lambda p: f"edit notebook cell {p.get('cell_number', 'unknown')}" if 'cell_number' in p else 'edit notebook cell',
-            'InstallPackages': lambda p: f"install packages: {', '.join(p.get('packages', ['unknown']))}" if p.get('packages') else 'install packages',
-            'ArtifactManagement': lambda p: f"{p.get('action_type', 'manage')} artifacts" if p.get('action_type') else 'manage artifacts',
-            'Agent': lambda p: f"delegate task: {p.get('description', 'unknown task')}" if p.get('description') else 'delegate to sub-agent'
-        }
-
-        if tool_name in tool_reasons:
+        reason = _TOOL_REASONS.get(tool_name)
+        if reason is not None:
             try:
-                return tool_reasons[tool_name](params)
+                return reason(params)
             except Exception:
                 return f"use {tool_name}"
-        else:
-            return f"use {tool_name}"
+        return f"use {tool_name}"
 
     def _handle_execution_error(self, error_msg: str, original_code: str, original_query: str = None, retry_count: int = 0):
         """Enhanced error handling for both dependencies and code logic errors"""
@@ -30,6 +30,9 @@ except ImportError:
         pass
 
 
+from ..core.runtime import AgentRuntime
+
+
 class ToolExecutionProgressTracker:
     """Tracks and displays tool execution progress in real-time"""
 
@@ -92,6 +95,7 @@ class ToolExecutionProgressTracker:
     def request_interrupt(self):
         """Request interruption of current tool execution"""
         self._interrupt_requested = True
+        AgentRuntime.request_interrupt()
 
     def is_interrupt_requested(self) -> bool:
         """Check if interruption has been requested"""
@@ -0,0 +1,87 @@
+"""
+Tests for the ArtifactManagement folder scan and duplicate finder
+"""
+import asyncio
+import threading
+
+from tatty_agent.tools.artifacts import _identical_files, _scan_folders
+from tatty_agent.tools.registry import ToolRegistry
+
+
+def _files(tmp_path, contents):
+    files = []
+    for name, content in contents.items():
+        path = tmp_path / name
+        path.write_bytes(content)
+        files.append((str(path), len(content)))
+    return files
+
+
+def test_identical_files_groups_by_content(tmp_path):
+    files = _files(tmp_path, {
+        "a.csv": b"1,2,3\n",
+        "b.csv": b"1,2,3\n",
+        "c.csv": b"4,5,6\n",  # same size, different content
+        "d.csv": b"1,2,3\n",
+        "e.txt": b"other\n",
+        "f.txt": b"other\n",
+        "g.txt": b"unique content\n",
+    })
+
+    groups = _identical_files(files)
+
+    assert groups == [
+        [str(tmp_path / "a.csv"), str(tmp_path / "b.csv"), str(tmp_path / "d.csv")],
+        [str(tmp_path / "e.txt"), str(tmp_path / "f.txt")],
+    ]
+
+
+def test_identical_files_ignores_empty_files(tmp_path):
+    files = _files(tmp_path, {"a.txt": b"", "b.txt": b""})
+    assert _identical_files(files) == []
+
+
+def test_identical_files_skips_unreadable_files(tmp_path):
+    files = _files(tmp_path, {"a.txt": b"same", "b.txt": b"same"})
+    files.append((str(tmp_path / "missing.txt"), 4))
+
+    assert _identical_files(files) == [[str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]]
+
+
+def test_artifact_management_runs_off_the_event_loop():
+    # Duplicate detection hashes file contents, which must not block the loop
+    threads = []
+
+    def handler(tool, working_dir="."):
+        threads.append(threading.get_ident())
+        return "done"
+
+    registry = ToolRegistry()
+    registry.register_tool("ArtifactManagement", handler)
+    tool = type("ArtifactManagementTool", (), {"action": "ArtifactManagement"})()
+
+    async def execute():
+        return await registry.execute(tool), threading.get_ident()
+
+    result, loop_thread = asyncio.run(execute())
+
+    assert result == "done"
+    assert threads and threads[0] != loop_thread
+
+
+def test_scan_folders_keeps_folder_order(tmp_path):
+    for name in ("scripts", "data"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f"{name}.py").write_text("x")
+    folders = [str(tmp_path / name) for name in ("data", "missing", "scripts")]
+
+    scans = _scan_folders(folders, "*.py")
+
+    assert scans == [[(str(tmp_path / "data" / "data.py"), 1)], None, [(str(tmp_path / "scripts" / "scripts.py"), 1)]]
+
+
+def test_scan_folders_single_and_empty(tmp_path):
+    (tmp_path / "a.csv").write_text("1,2")
+
+    assert _scan_folders([str(tmp_path)], "*.csv") == [[(str(tmp_path / "a.csv"), 3)]]
+    assert _scan_folders([], "*.csv") == []
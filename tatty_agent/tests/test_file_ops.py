@@ -0,0 +1,159 @@
+"""
+Tests for the Read, Edit and Write file tools
+"""
+import os
+import stat
+
+import pytest
+
+from tatty_agent.tools import file_ops
+from tatty_agent.tools.file_ops import execute_edit, execute_read, execute_write
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="needs POSIX file modes")
+
+
+def _tool(name, **fields):
+    return type(name, (), fields)()
+
+
+def _read(path, offset=None, limit=None):
+    return execute_read(_tool("ReadTool", file_path=str(path), offset=offset, limit=limit))
+
+
+def _edit(path, old, new, replace_all=False):
+    return execute_edit(_tool(
+        "EditTool", file_path=str(path), old_string=old, new_string=new, replace_all=replace_all
+    ))
+
+
+@pytest.fixture(autouse=True)
+def clear_read_cache():
+    file_ops._READ_CACHE.clear()
+    yield
+    file_ops._READ_CACHE.clear()
+
+
+@pytest.fixture
+def formatted(monkeypatch):
+    """Paths of the windows formatted from disk, i.e. the cache misses"""
+    calls = []
+    format_window = file_ops._format_window
+
+    def counting(path, *args):
+        calls.append(path)
+        return format_window(path, *args)
+
+    monkeypatch.setattr(file_ops, "_format_window", counting)
+    return calls
+
+
+def test_read_formats_numbered_window(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 11)))
+
+    output = _read(path, offset=2, limit=3)
+
+    assert output.startswith("     3|line 3\n     4|line 4\n     5|line 5")
+    assert "showing lines 3-5 of 10 total lines (5 lines remaining)" in output
+    assert "offset=5, limit=5" in output
+
+
+def test_read_serves_unchanged_file_from_cache(tmp_path, formatted):
+    path = tmp_path / "cached.txt"
+    path.write_text("hello\n")
+
+    first = _read(path)
+    second = _read(path)
+
+    assert first == second == "     1|hello"
+    assert len(formatted) == 1
+
+
+def test_read_cache_picks_up_edits(tmp_path, formatted):
+    path = tmp_path / "cached.txt"
+    path.write_text("hello\n")
+    assert _read(path) == "     1|hello"
+
+    # Same size, so only the mtime and inode of the atomic replace tell
+    # the two versions apart
+    assert _edit(path, "hello", "world").startswith("Successfully edited")
+
+    assert _read(path) == "     1|world"
+    assert len(formatted) == 2
+
+
+def test_read_does_not_cache_large_outputs(tmp_path, formatted, monkeypatch):
+    monkeypatch.setattr(file_ops, "_READ_CACHE", file_ops._OutputCache(max_chars=1000, entry_max=100))
+    path = tmp_path / "large.txt"
+    path.write_text("x" * 200 + "\n")
+
+    _read(path)
+    _read(path)
+
+    assert len(formatted) == 2
+
+
+def test_output_cache_evicts_least_recently_used_over_budget():
+    cache = file_ops._OutputCache(max_chars=10, entry_max=10)
+    cache.put(("a",), "aaaa")
+    cache.put(("b",), "bbbb")
+    assert cache.get(("a",)) == "aaaa"
+
+    # 12 characters are over budget, so "b", used least recently, goes
+    cache.put(("c",), "cccc")
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == "aaaa"
+    assert cache.get(("c",)) == "cccc"
+
+
+@pytest.mark.parametrize("old, new, count", [
+    ("a", "bb", 3),
+    ("a-", "b", 2),
+    ("a", "b", 3),
+    ("a", "", 3),
+])
+def test_edit_replace_all_reports_count(tmp_path, old, new, count):
+    path = tmp_path / "edit.txt"
+    path.write_text("a-a-a")
+
+    result = _edit(path, old, new, replace_all=True)
+
+    assert result == f"Successfully edited {path} ({count} replacement(s))"
+    assert path.read_text() == "a-a-a".replace(old, new)
+
+
+def test_edit_rejects_ambiguous_match(tmp_path):
+    path = tmp_path / "edit.txt"
+    path.write_text("x = 1\nx = 1\n")
+
+    assert _edit(path, "x = 1", "x = 2") == "Error: old_string is not unique in file (found 2 occurrences)"
+    assert path.read_text() == "x = 1\nx = 1\n"
+
+
+@posix_only
+def test_write_keeps_existing_permissions(tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("echo old\n")
+    path.chmod(0o750)
+
+    execute_write(_tool("WriteTool", file_path=str(path), content="echo new\n"))
+
+    assert path.read_text() == "echo new\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o750
+
+
+@posix_only
+def test_write_applies_umask_to_new_files(tmp_path):
+    path = tmp_path / "new.txt"
+
+    old_umask = os.umask(0o027)
+    try:
+        execute_write(_tool("WriteTool", file_path=str(path), content="new\n"))
+    finally:
+        os.umask(old_umask)
+
+    assert path.read_text() == "new\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    # No temporary files are left behind
+    assert os.listdir(tmp_path) == ["new.txt"]
@@ -0,0 +1,82 @@
+"""
+Tests for the Glob tool's ripgrep fast path and glob fallback
+"""
+import asyncio
+import shutil
+import subprocess
+
+import pytest
+
+from tatty_agent.tools import system
+
+
+def _glob(pattern, working_dir):
+    tool = type("GlobTool", (), {"pattern": pattern, "path": None})()
+    return asyncio.run(system.execute_glob(tool, working_dir=str(working_dir)))
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A small project tree, searched from a different process cwd"""
+    project = tmp_path / "project"
+    (project / "src" / "pkg").mkdir(parents=True)
+    (project / "src" / "pkg" / "mod.py").write_text("")
+    (project / "src" / "main.py").write_text("")
+    (project / "build").mkdir()
+    (project / "build" / "gen.py").write_text("")
+    (project / "README.md").write_text("")
+    (project / ".gitignore").write_text("build/\n")
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    (elsewhere / "stray.py").write_text("")
+    monkeypatch.chdir(elsewhere)
+    return project
+
+
+@pytest.mark.parametrize("pattern", ["src/**/*.py", "**/*.py", "{root}/src/**/*.py"])
+def test_glob_matches_relative_to_working_dir(tree, pattern):
+    output = _glob(pattern.format(root=tree), tree)
+    assert {"src/main.py", "src/pkg/mod.py"} <= set(output.splitlines())
+    assert "stray.py" not in output
+
+
+def test_glob_lists_gitignored_files(tree):
+    assert "build/gen.py" in _glob("**/*.py", tree).splitlines()
+
+
+@pytest.mark.skipif(shutil.which("rg") is None, reason="needs ripgrep")
+def test_rg_files_runs_in_search_path(tree):
+    matches = asyncio.run(system._rg_files("**/*.py", str(tree)))
+    assert sorted(matches) == sorted(
+        str(tree / path) for path in ("build/gen.py", "src/main.py", "src/pkg/mod.py")
+    )
+
+
+def test_glob_only_sends_name_patterns_to_rg(tree, monkeypatch):
+    calls = []
+
+    async def fake_run_rg(args, cwd=None):
+        calls.append((args, cwd))
+        return subprocess.CompletedProcess(["rg", *args], 0, "src/main.py\n", "")
+
+    monkeypatch.setattr(system, "_run_rg", fake_run_rg)
+
+    assert _glob("**/*.py", tree) == "src/main.py"
+    [(args, cwd)] = calls
+    assert cwd == str(tree)
+    assert args[args.index("--glob") + 1] == "**/*.py"
+
+    calls.clear()
+    _glob("src/**/*.py", tree)
+    _glob(f"{tree}/**/*.py", tree)
+    assert calls == []
+
+
+def test_glob_falls_back_when_rg_finds_nothing(tree, monkeypatch):
+    async def fake_run_rg(args, cwd=None):
+        return subprocess.CompletedProcess(["rg", *args], 1, "", "")
+
+    monkeypatch.setattr(system, "_run_rg", fake_run_rg)
+
+    assert "src/pkg/mod.py" in _glob("**/*.py", tree).splitlines()
@@ -0,0 +1,67 @@
+"""
+Tests for the Grep tool's literal prefilter and ripgrep invocation
+"""
+import asyncio
+import subprocess
+
+import pytest
+
+from tatty_agent.tools import system
+from tatty_agent.tools.system import _required_literal
+
+
+@pytest.mark.parametrize("pattern, literal", [
+    (r"def handle_request", "def handle_request"),
+    (r"foo.*barbaz", "barbaz"),
+    (r"foo\.bar", "foo.bar"),
+    (r"a\(bc\)def", "a(bc)def"),
+    (r"\bword_here", "word_here"),
+    (r"\w-foo-bar", "-foo-bar"),
+    (r"\d+--verbose", "--verbose"),
+    (r"colou?r_name", "r_name"),
+    (r"x{2,3}abcdef", "abcdef"),
+    (r"[abc]+literal", "literal"),
+])
+def test_required_literal(pattern, literal):
+    assert _required_literal(pattern) == literal
+
+
+@pytest.mark.parametrize("pattern", [
+    r"ab|cd",
+    r"(?i)hello",
+    r"\x41bcdef",
+    r"(abc)\1",
+    # rg reads \< and \> as word boundaries, not literal angle brackets
+    r"\<handler_name",
+    r"handler_name\>",
+    r"abc\/def",
+    "trailing\\",
+])
+def test_required_literal_gives_up(pattern):
+    assert _required_literal(pattern) is None
+
+
+def test_required_literal_skips_group_contents():
+    assert _required_literal(r"(optional)?rest") == "rest"
+
+
+@pytest.mark.parametrize("pattern", [r"\w-foo-bar", r"\d+--verbose", "-plain"])
+def test_grep_passes_patterns_as_regexp_arguments(monkeypatch, tmp_path, pattern):
+    calls = []
+
+    async def fake_run_rg(args):
+        calls.append(args)
+        return subprocess.CompletedProcess(["rg", *args], 1, "", "")
+
+    monkeypatch.setattr(system, "_run_rg", fake_run_rg)
+    tool = type("GrepTool", (), {"pattern": pattern, "path": None, "include": None})()
+
+    result = asyncio.run(system.execute_grep(tool, working_dir=str(tmp_path)))
+
+    assert result == f"No matches found for pattern: {pattern}"
+    assert calls
+    for args in calls:
+        # The pattern follows --regexp and the path follows --, so a leading
+        # '-' is never read as an option
+        assert args[args.index("--regexp") + 1] in (pattern, _required_literal(pattern))
+        assert args[args.index("--") + 1:] == [str(tmp_path)]
@@ -0,0 +1,135 @@
+"""
+Tests for the subprocess helpers used by shell-based tools
+"""
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from tatty_agent.tools import process
+from tatty_agent.tools.process import OutputWindow, first_lines, run_subprocess, stream_subprocess
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="needs POSIX process groups")
+
+
+def _window(lines, limit=5, head=2, tail=2):
+    window = OutputWindow(limit, head, tail)
+    for line in lines:
+        window.add(line)
+    return window
+
+
+def test_output_window_drops_leading_and_trailing_blank_lines():
+    window = _window(["", "  ", "  first", "", "second  ", "", ""])
+    assert window.total == 3
+    assert not window.truncated
+    assert window.head == ["first", "", "second"]
+    assert window.tail == []
+
+
+def test_output_window_blank_only_output():
+    window = _window(["", " ", "\t"])
+    assert window.total == 0
+    assert window.head == []
+    assert window.tail == []
+
+
+def test_output_window_truncates_to_head_and_tail():
+    window = _window([f"line {i}" for i in range(10)], limit=5, head=2, tail=3)
+    assert window.total == 10
+    assert window.truncated
+    assert window.head == ["line 0", "line 1"]
+    assert window.tail == ["line 7", "line 8", "line 9"]
+
+
+def test_output_window_at_limit_is_not_truncated():
+    window = _window([f"line {i}" for i in range(5)], limit=5)
+    assert not window.truncated
+    assert window.head == [f"line {i}" for i in range(5)]
+
+
+@pytest.mark.parametrize("text, count, expected", [
+    ("a\nb\nc", 2, "a\nb"),
+    ("a\nb\nc", 3, "a\nb\nc"),
+    ("a\nb\nc", 10, "a\nb\nc"),
+    ("a\nb\n", 2, "a\nb"),
+    ("a\nb", 0, ""),
+    ("", 3, ""),
+])
+def test_first_lines(text, count, expected):
+    assert first_lines(text, count) == expected
+
+
+def test_run_subprocess_captures_output():
+    result = asyncio.run(run_subprocess([sys.executable, "-c", "print('out'); import sys; sys.exit(3)"]))
+    assert result.returncode == 3
+    assert result.stdout == "out\n"
+
+
+def test_run_subprocess_missing_executable():
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(run_subprocess(["tatty-no-such-command"]))
+
+
+def test_run_subprocess_truncates_at_max_output():
+    code = "import sys; sys.stdout.write('x' * 1000); sys.stderr.write('e' * 10)"
+    result = asyncio.run(run_subprocess([sys.executable, "-c", code], max_output=100))
+    assert result.stdout == "x" * 100 + "\n... [output truncated: showing first 100 of 1000 bytes]"
+    assert result.stderr == "e" * 10
+
+
+def test_stream_subprocess_passes_each_line():
+    lines = []
+    code = "import sys; sys.stdout.write('one\\ntwo\\n\\nlast'); sys.stderr.write('err')"
+    result = asyncio.run(stream_subprocess([sys.executable, "-c", code], lines.append))
+    assert lines == ["one", "two", "", "last"]
+    assert result.returncode == 0
+    assert result.stdout is None
+    assert result.stderr == "err"
+
+
+def test_stream_subprocess_kills_child_when_on_line_raises():
+    def on_line(line):
+        raise RuntimeError(line)
+
+    code = "import time; print('boom', flush=True); time.sleep(30)"
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(stream_subprocess([sys.executable, "-c", code], on_line))
+    assert time.monotonic() - start < 10
+
+
+def test_run_subprocess_timeout_kills_chatty_command():
+    code = "while True: print('y' * 100)"
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_subprocess([sys.executable, "-c", code], timeout=0.5))
+    assert time.monotonic() - start < 10
+
+
+@posix_only
+def test_run_subprocess_timeout_kills_the_process_group(tmp_path):
+    marker = tmp_path / "marker"
+    # The grandchild would create the marker if it outlived the kill
+    cmd = f"(sleep 1; touch {marker}) & sleep 30"
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_subprocess(cmd, timeout=0.3, shell=True))
+    time.sleep(1.5)
+    assert not marker.exists()
+
+
+@posix_only
+@pytest.mark.skipif(shutil.which("setsid") is None, reason="needs setsid")
+def test_kill_stops_draining_pipes_held_by_a_detached_grandchild(monkeypatch):
+    monkeypatch.setattr(process, "_DRAIN_TIMEOUT", 0.3)
+    # setsid moves the grandchild out of the killed process group while it
+    # keeps the stdout and stderr pipes open
+    cmd = "setsid sleep 5 & sleep 30"
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_subprocess(cmd, timeout=0.3, shell=True))
+    assert time.monotonic() - start < 4
@@ -0,0 +1,28 @@
+"""
+Tests for configuration validation
+"""
+import pytest
+
+from tatty_agent.config.settings import ConfigLoader, TattyConfig
+
+
+def test_history_max_default():
+    assert TattyConfig().history_max == 1000
+
+
+@pytest.mark.parametrize("history_max", [0, -1, True, "5"])
+def test_history_max_rejects_invalid_values(history_max):
+    with pytest.raises(ValueError, match="history_max"):
+        TattyConfig(history_max=history_max)
+
+
+def test_history_max_checked_after_loading(monkeypatch):
+    monkeypatch.setenv("TATTY_HISTORY_MAX", "0")
+    loader = ConfigLoader().load_from_env()
+    with pytest.raises(ValueError, match="history_max"):
+        loader.get_config()
+
+
+def test_history_max_from_env(monkeypatch):
+    monkeypatch.setenv("TATTY_HISTORY_MAX", "25")
+    assert ConfigLoader().load_from_env().get_config().history_max == 25
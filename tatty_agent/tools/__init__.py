@@ -9,6 +9,7 @@ This package contains all tool implementations organized by category:
 - utility: Utility tools (todo management, notebook tools, plan mode)
 - development: Development tools (pytest, lint, typecheck, format, dependency, git)
 - artifacts: Artifact management and package installation
+- process: Async subprocess helpers shared by the tool modules
 
 All tool handlers have been successfully extracted from main.py and
 modularized during Phase 2.
@@ -5,26 +5,212 @@ This module contains artifact and package management tools extracted from main.p
 - ArtifactManagement: Manage and organize project artifacts in standard folders
 - InstallPackages: Install Python packages using uv or pip with safety checks
 """
+import fnmatch
+import functools
+import hashlib
+import shutil
 import subprocess
 import glob
 import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
+from typing import Iterator, Optional
 
 from ..baml_client import types
+from .process import OutputWindow, first_lines, stream_subprocess
 from .registry import register_tool
 
 
+# Standard artifact folders, by artifact type
+_ARTIFACT_FOLDERS = {
+    "script": ("scripts",),
+    "data": ("data",),
+    "visualization": ("visualization", "plots"),  # Include legacy plots folder
+    "any": ("scripts", "data", "visualization", "plots")
+}
+
+# Standard folder for root files the organize action suggests moving, by extension
+_ORGANIZE_TARGETS = {
+    **dict.fromkeys(('.py', '.ipynb'), "scripts"),
+    **dict.fromkeys(('.csv', '.json', '.txt', '.xlsx'), "data"),
+    **dict.fromkeys(('.png', '.jpg', '.svg', '.pdf', '.html'), "visualization"),
+}
+
+# Entry-point scripts that belong in the project root
+_ROOT_SCRIPT_PREFIXES = ('main.', 'tui.', 'agent_runtime.')
+
+# Bytes read at a time when hashing files for duplicate detection
+_HASH_CHUNK_SIZE = 64 * 1024
+
+# Shared pool for scanning artifact folders concurrently, one thread per
+# folder of the largest folder set. Threads are only started when first needed.
+_SCAN_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(map(len, _ARTIFACT_FOLDERS.values())),
+    thread_name_prefix="tatty-artifacts"
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_name_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile a glob-style name pattern once and reuse it across scans"""
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+
+def _match_entries(root: str, pattern: str, recursive: bool = False) -> Iterator[os.DirEntry]:
+    """
+    Yield entries under root whose name matches a glob-style pattern.
+
+    Mirrors glob for plain name patterns: hidden entries only match patterns
+    that start with '.', and a recursive walk (like "**") skips hidden
+    directories. Symlinked directories are not descended into. Each directory
+    is read once with os.scandir, so callers can reuse the DirEntry's cached
+    type and stat information.
+    """
+    regex = _compile_name_pattern(pattern)
+    include_hidden = pattern.startswith('.')
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                hidden = entry.name.startswith('.')
+                if (include_hidden or not hidden) and regex.match(os.path.normcase(entry.name)):
+                    yield entry
+                if recursive and not hidden and entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+
+def _find_artifacts(root: str, pattern: str, recursive: bool = False) -> list[tuple[str, int]]:
+    """
+    Find paths under root matching pattern, with their sizes in bytes.
+
+    Plain name patterns are matched during a scandir walk and sized from the
+    DirEntry stat; patterns containing a path separator or "**" fall back to
+    glob.
+
+    Args:
+        root: Folder to search
+        pattern: Glob-style pattern
+        recursive: Also search subfolders (like root/**/pattern)
+    """
+    if '/' in pattern or os.sep in pattern or '**' in pattern:
+        glob_pattern = os.path.join(root, "**", pattern) if recursive else os.path.join(root, pattern)
+        return [(path, os.path.getsize(path)) for path in glob.glob(glob_pattern, recursive=True)]
+    return [(entry.path, entry.stat().st_size) for entry in _match_entries(root, pattern, recursive)]
+
+
+def _scan_folders(folder_paths: list[str], pattern: str, recursive: bool = False) -> list[Optional[list[tuple[str, int]]]]:
+    """
+    Find artifacts in several folders concurrently.
+
+    Each folder is scanned in a worker thread, so the directory reads and
+    stats of different folders overlap (which matters on network or FUSE
+    mounts, where every syscall waits on I/O). A single folder is scanned
+    inline.
+
+    Returns:
+        (path, size) lists in the order of folder_paths, with None for folders
+        that don't exist
+    """
+    def scan(folder_path: str) -> Optional[list[tuple[str, int]]]:
+        if not os.path.exists(folder_path):
+            return None
+        return _find_artifacts(folder_path, pattern, recursive)
+
+    if len(folder_paths) <= 1:
+        return [scan(folder_path) for folder_path in folder_paths]
+    return list(_SCAN_EXECUTOR.map(scan, folder_paths))
+
+
+def _relative_path(path: str, prefix: Optional[str], start: str) -> str:
+    """
+    Path relative to start.
+
+    Args:
+        path: Path to make relative
+        prefix: os.path.join(start, ""); paths built by appending to it are
+            sliced instead of normalized. None always uses os.path.relpath.
+        start: Directory the result is relative to
+    """
+    if prefix is not None and path.startswith(prefix):
+        return path[len(prefix):]
+    return os.path.relpath(path, start)
+
+
+def _artifact_line(relative_path: str, file_size: int) -> str:
+    """One listing line for an artifact, with a human-readable size"""
+    if file_size < 10000:
+        return f"  - {relative_path} ({file_size:,} bytes)"
+    return f"  - {relative_path} ({file_size//1024:,} KB)"
+
+
+def _file_digest(path: str) -> Optional[bytes]:
+    """
+    BLAKE2b digest of a file's content, or None if it cannot be read.
+
+    The file is read unbuffered into one reused buffer, so hashing a large
+    file allocates nothing per chunk.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = bytearray(_HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            while size := f.readinto(buffer):
+                digest.update(view[:size])
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def _identical_files(files: list[tuple[str, int]]) -> list[list[str]]:
+    """
+    Group files with identical content.
+
+    Files are grouped by size first, and only files that share their size
+    with another file are hashed, so most files are never read. Empty files
+    are ignored.
+
+    Args:
+        files: (path, size) pairs
+
+    Returns:
+        Lists of two or more paths with the same content, ordered by path
+    """
+    by_size = defaultdict(list)
+    for path, size in files:
+        if size:
+            by_size[size].append(path)
+
+    groups = []
+    for paths in by_size.values():
+        if len(paths) < 2:
+            continue
+        by_digest = defaultdict(list)
+        for path in paths:
+            digest = _file_digest(path)
+            if digest is not None:
+                by_digest[digest].append(path)
+        groups.extend(sorted(group) for group in by_digest.values() if len(group) > 1)
+    groups.sort()
+    return groups
+
+
 @register_tool("ArtifactManagement")
 def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir: str = ".") -> str:
     """Manage and organize project artifacts in standard folders"""
     try:
-        # Define standard artifact folders
-        artifact_folders = {
-            "script": ["scripts"],
-            "data": ["data"],
-            "visualization": ["visualization", "plots"],  # Include legacy plots folder
-            "any": ["scripts", "data", "visualization", "plots"]
-        }
+        # Artifact paths are built by appending to this prefix, so their path
+        # relative to working_dir is a slice rather than an os.path.relpath
+        # (which normalizes both paths on every call)
+        wd_prefix = os.path.join(working_dir, "")
 
         output_lines = []
         output_lines.append(f"🗂️ Artifact Management: {tool.action_type}")
@@ -47,26 +233,28 @@ def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir:
 
             if tool.folder:
                 folders_to_check = [tool.folder]
-            elif tool.artifact_type and tool.artifact_type in artifact_folders:
-                folders_to_check = artifact_folders[tool.artifact_type]
+            elif tool.artifact_type and tool.artifact_type in _ARTIFACT_FOLDERS:
+                folders_to_check = _ARTIFACT_FOLDERS[tool.artifact_type]
             else:
-                folders_to_check = artifact_folders["any"]
+                folders_to_check = _ARTIFACT_FOLDERS["any"]
 
-            total_files = 0
-            for folder in folders_to_check:
-                folder_path = os.path.join(working_dir, folder)
-                if os.path.exists(folder_path):
-                    pattern = tool.pattern or "*"
-                    search_path = os.path.join(folder_path, pattern)
-                    files = glob.glob(search_path, recursive=True)
+            scans = _scan_folders(
+                [os.path.join(working_dir, folder) for folder in folders_to_check],
+                tool.pattern or "*"
+            )
 
+            total_files = 0
+            for folder, files in zip(folders_to_check, scans):
+                if files is not None:
                     if files:
+                        # A user-supplied folder like "./data" still needs relpath
+                        # to normalize it
+                        prefix = wd_prefix if os.path.normpath(folder) == folder != os.curdir else None
                         output_lines.append(f"📁 {folder}/ ({len(files)} files):")
-                        for file_path in sorted(files):
-                            relative_path = os.path.relpath(file_path, working_dir)
-                            file_size = os.path.getsize(file_path)
-                            size_str = f"({file_size:,} bytes)" if file_size < 10000 else f"({file_size//1024:,} KB)"
-                            output_lines.append(f"  - {relative_path} {size_str}")
+                        output_lines.extend(
+                            _artifact_line(_relative_path(file_path, prefix, working_dir), file_size)
+                            for file_path, file_size in sorted(files)
+                        )
                         total_files += len(files)
                         output_lines.append("")
                     else:
@@ -83,33 +271,27 @@ def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir:
             if not tool.pattern:
                 return "❌ Error: pattern parameter required for 'find' action"
 
-            all_matches = []
-            for folder in artifact_folders["any"]:
-                folder_path = os.path.join(working_dir, folder)
-                if os.path.exists(folder_path):
-                    search_path = os.path.join(folder_path, "**", tool.pattern)
-                    matches = glob.glob(search_path, recursive=True)
-                    all_matches.extend(matches)
+            scans = _scan_folders(
+                [wd_prefix + folder for folder in _ARTIFACT_FOLDERS["any"]],
+                tool.pattern,
+                recursive=True
+            )
+            all_matches = [match for matches in scans if matches for match in matches]
 
             if all_matches:
                 output_lines.append(f"🔍 Found {len(all_matches)} matches for '{tool.pattern}':")
                 output_lines.append("")
 
                 # Group by folder
-                by_folder = {}
-                for match in sorted(all_matches):
-                    relative_path = os.path.relpath(match, working_dir)
-                    folder_name = relative_path.split('/')[0]
-                    if folder_name not in by_folder:
-                        by_folder[folder_name] = []
-                    by_folder[folder_name].append(relative_path)
+                by_folder = defaultdict(list)
+                for match, file_size in sorted(all_matches):
+                    relative_path = _relative_path(match, wd_prefix, working_dir)
+                    folder_name = relative_path.partition(os.sep)[0]
+                    by_folder[folder_name].append((relative_path, file_size))
 
                 for folder_name, files in by_folder.items():
                     output_lines.append(f"📁 {folder_name}/:")
-                    for file_path in files:
-                        file_size = os.path.getsize(os.path.join(working_dir, file_path))
-                        size_str = f"({file_size:,} bytes)" if file_size < 10000 else f"({file_size//1024:,} KB)"
-                        output_lines.append(f"  - {file_path} {size_str}")
+                    output_lines.extend(_artifact_line(file_path, file_size) for file_path, file_size in files)
                     output_lines.append("")
             else:
                 output_lines.append(f"🔍 No matches found for pattern '{tool.pattern}'")
@@ -118,11 +300,19 @@ def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir:
 
         elif action_type == "organize":
             # Ensure all standard folders exist and provide organization tips
+            # One read of the root serves both the folder check and the
+            # organization suggestions below
+            try:
+                with os.scandir(working_dir) as entries:
+                    root_entries = [entry for entry in entries if not entry.name.startswith('.')]
+            except FileNotFoundError:
+                root_entries = []
+            existing = {entry.name for entry in root_entries}
+
             created_folders = []
-            for folder in artifact_folders["any"]:
-                folder_path = os.path.join(working_dir, folder)
-                if not os.path.exists(folder_path):
-                    os.makedirs(folder_path, exist_ok=True)
+            for folder in _ARTIFACT_FOLDERS["any"]:
+                if folder not in existing:
+                    os.makedirs(wd_prefix + folder, exist_ok=True)
                     created_folders.append(folder)
 
             if created_folders:
@@ -130,18 +320,15 @@ def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir:
                 output_lines.append("")
 
             # Check for files in root that should be organized
-            root_files = glob.glob(os.path.join(working_dir, "*"))
-            root_files = [f for f in root_files if os.path.isfile(f)]
-
             suggestions = []
-            for file_path in root_files:
-                filename = os.path.basename(file_path)
-                if filename.endswith(('.py', '.ipynb')) and not filename.startswith(('main.', 'tui.', 'agent_runtime.')):
-                    suggestions.append(f"  mv {filename} scripts/")
-                elif filename.endswith(('.csv', '.json', '.txt', '.xlsx')):
-                    suggestions.append(f"  mv {filename} data/")
-                elif filename.endswith(('.png', '.jpg', '.svg', '.pdf', '.html')):
-                    suggestions.append(f"  mv {filename} visualization/")
+            for entry in root_entries:
+                if not entry.is_file():
+                    continue
+                target = _ORGANIZE_TARGETS.get(os.path.splitext(entry.name)[1])
+                if target == "scripts" and entry.name.startswith(_ROOT_SCRIPT_PREFIXES):
+                    continue
+                if target:
+                    suggestions.append(f"  mv {entry.name} {target}/")
 
             if suggestions:
                 output_lines.append("💡 Organization suggestions for root directory files:")
@@ -159,8 +346,8 @@ def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir:
         elif action_type == "clean":
             # Clean up empty folders and provide cleanup suggestions
             empty_folders = []
-            for folder in artifact_folders["any"]:
-                folder_path = os.path.join(working_dir, folder)
+            for folder in _ARTIFACT_FOLDERS["any"]:
+                folder_path = wd_prefix + folder
                 if os.path.exists(folder_path) and not os.listdir(folder_path):
                     empty_folders.append(folder)
 
@@ -169,36 +356,53 @@ def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir:
                 output_lines.append("These folders are kept for future artifact organization")
                 output_lines.append("")
 
-            # Check for duplicate files
+            # Check for duplicate files, by name and by content
             output_lines.append("🔍 Checking for potential duplicates...")
-            # This is a basic check - could be enhanced with content comparison
-            all_files = []
-            for folder in artifact_folders["any"]:
-                folder_path = os.path.join(working_dir, folder)
-                if os.path.exists(folder_path):
-                    files = glob.glob(os.path.join(folder_path, "**/*"), recursive=True)
-                    all_files.extend([f for f in files if os.path.isfile(f)])
-
-            filenames = {}
-            for file_path in all_files:
-                filename = os.path.basename(file_path)
-                if filename not in filenames:
-                    filenames[filename] = []
-                filenames[filename].append(file_path)
-
-            duplicates = {name: paths for name, paths in filenames.items() if len(paths) > 1}
+            files = []
+            sizes = []
+            for folder in _ARTIFACT_FOLDERS["any"]:
+                # One scandir walk per folder; DirEntry already has the name,
+                # file type and (on most platforms) stat, so no per-path stat
+                # or basename is needed
+                for entry in _match_entries(wd_prefix + folder, "*", recursive=True):
+                    if entry.is_file():
+                        files.append((entry.name, entry.path))
+                        sizes.append((entry.path, entry.stat().st_size))
+
+            # Sorting by name puts equal names next to each other, so groupby
+            # finds the duplicates without a list per unique filename. Only
+            # the groups that are shown are kept.
+            files.sort(key=itemgetter(0))
+            duplicates = []
+            duplicate_count = 0
+            for filename, group in groupby(files, key=itemgetter(0)):
+                paths = [path for _, path in group]
+                if len(paths) > 1:
+                    duplicate_count += 1
+                    if len(duplicates) < 5:  # Show first 5
+                        duplicates.append((filename, paths))
+
             if duplicates:
-                output_lines.append(f"⚠️ Found {len(duplicates)} potential duplicate filenames:")
-                for filename, paths in list(duplicates.items())[:5]:  # Show first 5
+                output_lines.append(f"⚠️ Found {duplicate_count} potential duplicate filenames:")
+                for filename, paths in duplicates:
                     output_lines.append(f"  {filename}:")
                     for path in paths:
-                        relative_path = os.path.relpath(path, working_dir)
-                        output_lines.append(f"    - {relative_path}")
-                if len(duplicates) > 5:
-                    output_lines.append(f"  ... and {len(duplicates) - 5} more")
+                        output_lines.append(f"    - {_relative_path(path, wd_prefix, working_dir)}")
+                if duplicate_count > 5:
+                    output_lines.append(f"  ... and {duplicate_count - 5} more")
             else:
                 output_lines.append("✅ No duplicate filenames found")
 
+            identical = _identical_files(sizes)
+            if identical:
+                output_lines.append(f"⚠️ Found {len(identical)} sets of files with identical content:")
+                for paths in identical[:5]:  # Show first 5
+                    output_lines.append("  " + ", ".join(_relative_path(path, wd_prefix, working_dir) for path in paths))
+                if len(identical) > 5:
+                    output_lines.append(f"  ... and {len(identical) - 5} more")
+            else:
+                output_lines.append("✅ No files with identical content found")
+
         else:
             return f"❌ Error: Unknown action_type '{tool.action_type}'. Use 'list', 'find', 'organize', or 'clean'"
 
@@ -208,8 +412,52 @@ def execute_artifact_management(tool: types.ArtifactManagementTool, working_dir:
         return f"❌ Error managing artifacts: {str(e)}"
 
 
+# Names of non-Python tools that users sometimes try to install with pip
+_NON_PYTHON_INDICATORS = (
+    'brew', 'homebrew', 'apt', 'yum', 'pacman',  # Package managers
+    'node', 'npm', 'yarn',  # Node.js
+    'docker', 'kubernetes', 'helm',  # Container tools
+    'git', 'svn', 'mercurial',  # VCS (use GitPython instead)
+    'redis', 'mongodb', 'postgresql',  # Databases (use Python clients)
+    'nginx', 'apache', 'mysql',  # Servers
+    'terraform', 'ansible',  # Infrastructure
+    'ruby', 'go', 'rust', 'java',  # Other languages
+)
+
+# An indicator on its own, or followed by '-'/'_' (e.g. "docker-compose").
+# Names that merely contain one, like GitPython, don't match.
+_NON_PYTHON_PACKAGE_RE = re.compile(
+    r'(?:' + '|'.join(map(re.escape, _NON_PYTHON_INDICATORS)) + r')(?:[-_]|\Z)'
+)
+
+# Python wrappers whose names would otherwise match an indicator
+_PYTHON_WRAPPER_PACKAGES = frozenset({
+    "redis-py", "redis_py", "docker-py", "docker_py",
+    "postgresql-py", "mysql-py"
+})
+
+_PYTHON_ALTERNATIVES = {
+    'git': 'GitPython',
+    'redis': 'redis-py',
+    'mongodb': 'pymongo',
+    'postgresql': 'psycopg2-binary',
+    'mysql': 'PyMySQL',
+    'sqlite': 'sqlite3 (built-in)',
+    'docker': 'docker-py',
+    'kubernetes': 'kubernetes-client',
+    'node': 'pynode or find Python equivalent',
+    'npm': 'find Python equivalent',
+}
+
+
+def _is_non_python_package(package: str) -> bool:
+    """Whether a package name refers to a system tool rather than a PyPI package"""
+    package_lower = package.lower()
+    return bool(_NON_PYTHON_PACKAGE_RE.match(package_lower)) and package_lower not in _PYTHON_WRAPPER_PACKAGES
+
+
 @register_tool("InstallPackages")
-def execute_install_packages(tool: types.InstallPackagesTool, working_dir: str = ".") -> str:
+async def execute_install_packages(tool: types.InstallPackagesTool, working_dir: str = ".") -> str:
     """Install Python packages using uv or pip with user permission"""
     try:
         # Safety check - require user confirmation
@@ -221,59 +469,7 @@ def execute_install_packages(tool: types.InstallPackagesTool, working_dir: str =
             return "❌ Error: No packages specified for installation"
 
         # Validate Python packages only
-        non_python_indicators = [
-            'brew', 'homebrew', 'apt', 'yum', 'pacman',  # Package managers
-            'node', 'npm', 'yarn',  # Node.js
-            'docker', 'kubernetes', 'helm',  # Container tools
-            'git', 'svn', 'mercurial',  # VCS (use GitPython instead)
-            'redis', 'mongodb', 'postgresql',  # Databases (use Python clients)
-            'nginx', 'apache', 'mysql',  # Servers
-            'terraform', 'ansible',  # Infrastructure
-            'ruby', 'go', 'rust', 'java',  # Other languages
-        ]
-
-        invalid_packages = []
-        python_alternatives = {
-            'git': 'GitPython',
-            'redis': 'redis-py',
-            'mongodb': 'pymongo',
-            'postgresql': 'psycopg2-binary',
-            'mysql': 'PyMySQL',
-            'sqlite': 'sqlite3 (built-in)',
-            'docker': 'docker-py',
-            'kubernetes': 'kubernetes-client',
-            'node': 'pynode or find Python equivalent',
-            'npm': 'find Python equivalent',
-        }
-
-        for package in packages:
-            package_lower = package.lower()
-
-            # Check if package name exactly matches or starts with non-Python indicators
-            # But allow Python wrappers that contain these terms (e.g., GitPython, redis-py)
-            is_invalid = False
-            for indicator in non_python_indicators:
-                # Exact match
-                if package_lower == indicator:
-                    is_invalid = True
-                    break
-                # Package starts with indicator followed by non-letter character
-                elif package_lower.startswith(indicator + "-") or package_lower.startswith(indicator + "_"):
-                    # Exception: allow common Python wrapper patterns
-                    python_wrapper_patterns = [
-                        "redis-py", "redis_py", "docker-py", "docker_py",
-                        "postgresql-py", "mysql-py"
-                    ]
-                    if package_lower not in python_wrapper_patterns:
-                        is_invalid = True
-                        break
-                # Standalone tool names (but allow Python wrappers like GitPython)
-                elif indicator in ["git", "node", "npm", "docker", "redis"] and package_lower == indicator:
-                    is_invalid = True
-                    break
-
-            if is_invalid:
-                invalid_packages.append(package)
+        invalid_packages = [package for package in packages if _is_non_python_package(package)]
 
         if invalid_packages:
             output_lines = []
@@ -283,8 +479,8 @@ def execute_install_packages(tool: types.InstallPackagesTool, working_dir: str =
             output_lines.append("Invalid packages:")
             for pkg in invalid_packages:
                 output_lines.append(f"  - {pkg}")
-                if pkg.lower() in python_alternatives:
-                    output_lines.append(f"    💡 Try instead: {python_alternatives[pkg.lower()]}")
+                if pkg.lower() in _PYTHON_ALTERNATIVES:
+                    output_lines.append(f"    💡 Try instead: {_PYTHON_ALTERNATIVES[pkg.lower()]}")
 
             output_lines.append("")
             output_lines.append("For system dependencies:")
@@ -307,30 +503,17 @@ def execute_install_packages(tool: types.InstallPackagesTool, working_dir: str =
         output_lines.append(f"Working directory: {working_dir}")
         output_lines.append("")
 
-        # Try uv first (preferred), then fallback to pip
-        uv_available = False
-        pip_available = False
+        # Try uv first (preferred), then fallback to pip. A PATH lookup finds
+        # them without spawning `uv --version` / `pip --version` probes, and
+        # isn't cached so a package manager installed mid-session is picked up.
+        uv_available = shutil.which("uv") is not None
+        pip_available = uv_available or shutil.which("pip") is not None
 
-        # Check if uv is available
-        try:
-            uv_result = subprocess.run(["uv", "--version"], capture_output=True, timeout=5, cwd=working_dir)
-            if uv_result.returncode == 0:
-                uv_available = True
-                output_lines.append("✅ Using uv (preferred package manager)")
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-
-        # Check if pip is available if uv isn't
-        if not uv_available:
-            try:
-                pip_result = subprocess.run(["pip", "--version"], capture_output=True, timeout=5, cwd=working_dir)
-                if pip_result.returncode == 0:
-                    pip_available = True
-                    output_lines.append("✅ Using pip (fallback package manager)")
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                pass
-
-        if not uv_available and not pip_available:
+        if uv_available:
+            output_lines.append("✅ Using uv (preferred package manager)")
+        elif pip_available:
+            output_lines.append("✅ Using pip (fallback package manager)")
+        else:
             return "❌ Error: Neither uv nor pip are available. Please install a package manager."
 
         # Build installation command
@@ -342,7 +525,8 @@ def execute_install_packages(tool: types.InstallPackagesTool, working_dir: str =
                 cmd.append("--upgrade")
             cmd.extend(packages)
         else:
-            cmd = ["pip", "install"]
+            # Skip pip's self-update check, an extra PyPI round-trip per install
+            cmd = ["pip", "install", "--disable-pip-version-check"]
             if tool.upgrade:
                 cmd.append("--upgrade")
             cmd.extend(packages)
@@ -351,37 +535,38 @@ def execute_install_packages(tool: types.InstallPackagesTool, working_dir: str =
         output_lines.append(f"Command: {' '.join(cmd)}")
         output_lines.append("")
 
-        result = subprocess.run(
+        # Installers can be chatty; only the last 20 lines of a long log are kept
+        stdout_window = OutputWindow(limit=50, head=0, tail=20)
+        result = await stream_subprocess(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout_window.add,
             timeout=300,  # 5 minutes timeout for installs
             cwd=working_dir
         )
 
         if result.returncode == 0:
             output_lines.append("✅ Installation completed successfully!")
-            if result.stdout.strip():
-                stdout_lines = result.stdout.strip().split('\n')
+            if stdout_window.total:
                 # Show relevant output (truncated for large installs)
-                if len(stdout_lines) > 50:
+                if stdout_window.truncated:
                     output_lines.append("\nInstallation output (truncated):")
-                    output_lines.extend(stdout_lines[-20:])  # Show last 20 lines
-                    output_lines.append(f"... (showing last 20 of {len(stdout_lines)} lines)")
+                    output_lines.extend(stdout_window.tail)  # Show last 20 lines
+                    output_lines.append(f"... (showing last 20 of {stdout_window.total} lines)")
                 else:
                     output_lines.append("\nInstallation output:")
-                    output_lines.extend(stdout_lines)
+                    output_lines.extend(stdout_window.head)
         else:
             output_lines.append("❌ Installation failed!")
             if result.stderr:
                 output_lines.append("\nError details:")
-                error_lines = result.stderr.strip().split('\n')
+                errors = result.stderr.strip()
+                error_total = errors.count('\n') + 1
                 # Show error details (truncated for very long errors)
-                if len(error_lines) > 30:
-                    output_lines.extend(error_lines[:20])
-                    output_lines.append(f"... (showing first 20 of {len(error_lines)} error lines)")
+                if error_total > 30:
+                    output_lines.append(first_lines(errors, 20))
+                    output_lines.append(f"... (showing first 20 of {error_total} error lines)")
                 else:
-                    output_lines.extend(error_lines)
+                    output_lines.append(errors)
 
             # Provide helpful suggestions
             output_lines.append("\n💡 Troubleshooting suggestions:")
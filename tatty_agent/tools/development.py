@@ -5,19 +5,57 @@ This module contains development-related tools extracted from main.py:
 - PytestRun: Run pytest tests with comprehensive options
 - Lint: Run Ruff linter with auto-fixing capabilities
 - TypeCheck: Run static type checking (mypy/pyright)
-- Format: Run code formatting (Ruff/Black)
+- Format: Run code formatting (Black)
 - Dependency: Manage Python dependencies (uv/pip)
 - GitDiff: View git diff information
 """
+import asyncio
+import functools
+import importlib.metadata
+import importlib.util
+import os
+import re
+import stat
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
+from typing import Optional
 
 from ..baml_client import types
+from .process import OutputWindow, first_lines, run_subprocess, stream_subprocess
 from .registry import register_tool
 
+# pytest's result line ("3 passed, 1 failed in 0.12s"), found in one regex scan
+_PYTEST_SUMMARY_RE = re.compile(r' (?:passed|failed|error)')
+
+# mypy/pyright error lines, matched case-insensitively without lowercasing
+_TYPE_ERROR_RE = re.compile(r'error:', re.IGNORECASE)
+
+# Distribution name at the start of a PEP 508 requirement, before any extras,
+# version specifier or environment marker
+_REQUIREMENT_NAME_RE = re.compile(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+
+# Runs of separators that PEP 503 treats as equivalent in distribution names
+_DISTRIBUTION_NAME_SEPARATORS_RE = re.compile(r'[-_.]+')
+
+# [tool.black] settings that _format_with_black_api maps onto black.Mode; any
+# other key (e.g. force-exclude, required-version) leaves the run to the CLI
+_BLACK_API_CONFIG_KEYS = frozenset({
+    "line_length", "skip_string_normalization", "skip_magic_trailing_comma", "target_version", "preview"
+})
+
+# Largest file _format_with_black_api formats in-process. Black holds the GIL
+# while it works (roughly 15 ms per KB with its safety checks), so bigger
+# files go to the black CLI, whose own process leaves the event loop free
+_BLACK_API_MAX_BYTES = 32 * 1024
+
+_DEPENDENCY_CHECK_TYPES = ("imports", "list", "missing", "outdated", "tree")
+
 
 @register_tool("PytestRun")
-def execute_pytest_run(tool: types.PytestRunTool, working_dir: str = ".") -> str:
+async def execute_pytest_run(tool: types.PytestRunTool, working_dir: str = ".") -> str:
     """Run pytest tests and return formatted results"""
     try:
         # Build pytest command
@@ -46,12 +84,23 @@ def execute_pytest_run(tool: types.PytestRunTool, working_dir: str = ".") -> str
         # Add output formatting
         cmd.extend(["--tb=short", "--no-header"])
 
+        # Stream stdout through a bounded window: only the first 100 and last
+        # 20 lines (plus the summary line) are ever kept in memory
+        stdout_window = OutputWindow(limit=100, head=50, tail=20)
+        summary_line = None
+
+        def on_line(line: str) -> None:
+            nonlocal summary_line
+            # Extract test summary
+            if summary_line is None and _PYTEST_SUMMARY_RE.search(line):
+                summary_line = line
+            stdout_window.add(line)
+
         # Execute with timeout
         timeout = (tool.timeout / 1000) if tool.timeout else 120
-        result = subprocess.run(
+        result = await stream_subprocess(
             cmd,
-            capture_output=True,
-            text=True,
+            on_line,
             timeout=timeout,
             cwd=working_dir
         )
@@ -65,38 +114,28 @@ def execute_pytest_run(tool: types.PytestRunTool, working_dir: str = ".") -> str
         output_lines.append("")
 
         # Process stdout
-        if result.stdout:
-            stdout_lines = result.stdout.strip().split('\n')
-
-            # Extract test summary
-            summary_line = None
-            for line in stdout_lines:
-                if " passed" in line or " failed" in line or " error" in line:
-                    summary_line = line
-                    break
-
+        if stdout_window.total:
             if summary_line:
                 output_lines.append(f"Test Summary: {summary_line}")
                 output_lines.append("")
 
             # Add detailed output (truncated if needed)
-            if len(stdout_lines) > 100:
-                output_lines.extend(stdout_lines[:50])
-                output_lines.append(f"\n... [Truncated: showing first 50 of {len(stdout_lines)} lines]")
+            output_lines.extend(stdout_window.head)
+            if stdout_window.truncated:
+                output_lines.append(f"\n... [Truncated: showing first 50 of {stdout_window.total} lines]")
                 output_lines.append("To see full output, run PytestRun with specific test_path")
-                output_lines.extend(stdout_lines[-20:])  # Show last 20 lines
-            else:
-                output_lines.extend(stdout_lines)
+                output_lines.extend(stdout_window.tail)  # Show last 20 lines
 
         # Add stderr if present
         if result.stderr:
             output_lines.append("\nErrors:")
-            stderr_lines = result.stderr.strip().split('\n')
-            if len(stderr_lines) > 20:
-                output_lines.extend(stderr_lines[:20])
-                output_lines.append(f"... [Error output truncated: {len(stderr_lines)} total lines]")
+            stderr = result.stderr.strip()
+            stderr_total = stderr.count('\n') + 1
+            if stderr_total > 20:
+                output_lines.append(first_lines(stderr, 20))
+                output_lines.append(f"... [Error output truncated: {stderr_total} total lines]")
             else:
-                output_lines.extend(stderr_lines)
+                output_lines.append(stderr)
 
         # Add exit code
         output_lines.append(f"\nExit code: {result.returncode}")
@@ -112,7 +151,7 @@ def execute_pytest_run(tool: types.PytestRunTool, working_dir: str = ".") -> str
 
 
 @register_tool("Lint")
-def execute_lint(tool: types.LintTool, working_dir: str = ".") -> str:
+async def execute_lint(tool: types.LintTool, working_dir: str = ".") -> str:
     """Run Ruff linter with optional auto-fixing"""
     try:
         # Build ruff command
@@ -138,11 +177,20 @@ def execute_lint(tool: types.LintTool, working_dir: str = ".") -> str:
         if tool.format and tool.format != "text":
             cmd.extend(["--format", tool.format])
 
+        stdout_window = OutputWindow(limit=50, head=40, tail=10)
+        issue_count = 0
+
+        def on_line(line: str) -> None:
+            nonlocal issue_count
+            # Count issues
+            if line.strip() and not line.startswith("Found"):
+                issue_count += 1
+            stdout_window.add(line)
+
         # Execute ruff
-        result = subprocess.run(
+        result = await stream_subprocess(
             cmd,
-            capture_output=True,
-            text=True,
+            on_line,
             timeout=60,  # Ruff is fast, 60s should be plenty
             cwd=working_dir
         )
@@ -159,17 +207,15 @@ def execute_lint(tool: types.LintTool, working_dir: str = ".") -> str:
             else:
                 output_lines.append("✅ No lint issues found")
 
-            if result.stdout and result.stdout.strip():
+            if stdout_window.total:
                 output_lines.append("Details:")
-                output_lines.append(result.stdout.strip())
+                output_lines.extend(stdout_window.head)
+                if stdout_window.truncated:
+                    output_lines.append(f"... [Truncated: showing first 40 of {stdout_window.total} lines]")
+                    output_lines.extend(stdout_window.tail)
         else:
             # Process lint issues
-            if result.stdout:
-                stdout_lines = result.stdout.strip().split('\n')
-
-                # Count issues
-                issue_count = len([line for line in stdout_lines if line.strip() and not line.startswith("Found")])
-
+            if stdout_window.total:
                 if issue_count > 0:
                     if tool.fix:
                         output_lines.append(f"🔧 Fixed {issue_count} issues:")
@@ -179,13 +225,11 @@ def execute_lint(tool: types.LintTool, working_dir: str = ".") -> str:
                     output_lines.append("")
 
                 # Truncate if too many issues
-                if len(stdout_lines) > 50:
-                    output_lines.extend(stdout_lines[:40])
-                    output_lines.append(f"\n... [Truncated: showing first 40 of {len(stdout_lines)} lines]")
+                output_lines.extend(stdout_window.head)
+                if stdout_window.truncated:
+                    output_lines.append(f"\n... [Truncated: showing first 40 of {stdout_window.total} lines]")
                     output_lines.append("Run with specific target_path to focus analysis")
-                    output_lines.extend(stdout_lines[-10:])
-                else:
-                    output_lines.extend(stdout_lines)
+                    output_lines.extend(stdout_window.tail)
 
         if result.stderr:
             output_lines.append("\nErrors:")
@@ -204,7 +248,7 @@ def execute_lint(tool: types.LintTool, working_dir: str = ".") -> str:
 
 
 @register_tool("TypeCheck")
-def execute_type_check(tool: types.TypeCheckTool, working_dir: str = ".") -> str:
+async def execute_type_check(tool: types.TypeCheckTool, working_dir: str = ".") -> str:
     """Run static type checking"""
     try:
         checker = tool.checker or "mypy"
@@ -238,11 +282,20 @@ def execute_type_check(tool: types.TypeCheckTool, working_dir: str = ".") -> str
         else:
             return f"Error: Unknown type checker '{checker}'. Use 'mypy' or 'pyright'"
 
+        stdout_window = OutputWindow(limit=30, head=25, tail=5)
+        error_count = 0
+
+        def on_line(line: str) -> None:
+            nonlocal error_count
+            # Count errors
+            if _TYPE_ERROR_RE.search(line):
+                error_count += 1
+            stdout_window.add(line)
+
         # Execute type checker
-        result = subprocess.run(
+        result = await stream_subprocess(
             cmd,
-            capture_output=True,
-            text=True,
+            on_line,
             timeout=120,  # Type checking can be slow
             cwd=working_dir
         )
@@ -256,29 +309,25 @@ def execute_type_check(tool: types.TypeCheckTool, working_dir: str = ".") -> str
 
         if result.returncode == 0:
             output_lines.append("✅ No type errors found")
-            if result.stdout:
+            if stdout_window.total:
                 # Sometimes mypy outputs success info
-                output_lines.append(result.stdout.strip())
+                output_lines.extend(stdout_window.head)
+                if stdout_window.truncated:
+                    output_lines.append(f"... [Truncated: showing first 25 of {stdout_window.total} lines]")
+                    output_lines.extend(stdout_window.tail)
         else:
             # Process type errors
-            if result.stdout:
-                stdout_lines = result.stdout.strip().split('\n')
-
-                # Count errors
-                error_count = sum(1 for line in stdout_lines if 'error:' in line.lower())
-
+            if stdout_window.total:
                 if error_count > 0:
                     output_lines.append(f"Found {error_count} type errors:")
                     output_lines.append("")
 
                 # Truncate if too many errors
-                if len(stdout_lines) > 30:
-                    output_lines.extend(stdout_lines[:25])
-                    output_lines.append(f"\n... [Truncated: showing first 25 of {len(stdout_lines)} lines]")
+                output_lines.extend(stdout_window.head)
+                if stdout_window.truncated:
+                    output_lines.append(f"\n... [Truncated: showing first 25 of {stdout_window.total} lines]")
                     output_lines.append("Run with specific target_path to focus analysis")
-                    output_lines.extend(stdout_lines[-5:])
-                else:
-                    output_lines.extend(stdout_lines)
+                    output_lines.extend(stdout_window.tail)
 
         if result.stderr:
             output_lines.append("\nWarnings/Errors:")
@@ -296,49 +345,133 @@ def execute_type_check(tool: types.TypeCheckTool, working_dir: str = ".") -> str
         return f"Error running {checker}: {str(e)}"
 
 
-@register_tool("Format")
-def execute_format(tool: types.FormatTool, working_dir: str = ".") -> str:
-    """Run code formatting"""
+@functools.lru_cache(maxsize=1)
+def _black_module():
+    """The black package, if it is importable in this interpreter"""
     try:
-        formatter = tool.formatter or "ruff"
-        target = tool.target_path or "."
+        import black
+    except ImportError:
+        return None
+    return black
+
+
+def _format_with_black_api(tool: types.FormatTool, target: str, working_dir: str) -> Optional[subprocess.CompletedProcess]:
+    """
+    Format a single file with black's Python API instead of the black CLI.
+
+    Saves starting a black process (interpreter startup plus black's own
+    imports) per call. Output, messages and exit code mirror the CLI's.
+
+    Returns:
+        CompletedProcess shaped like the CLI run's, or None when the run
+        should go through the CLI: black isn't importable here, the target
+        isn't a single .py/.pyi file of at most _BLACK_API_MAX_BYTES, the
+        project's black configuration uses settings not mapped here, or black
+        rejects the file or options
+    """
+    black = _black_module()
+    path = os.path.join(working_dir, target)
+    if black is None or not path.endswith(('.py', '.pyi')):
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode) or st.st_size > _BLACK_API_MAX_BYTES:
+        return None
 
-        if formatter == "ruff":
-            cmd = ["ruff", "format"]
+    try:
+        config_path = black.find_pyproject_toml((path,))
+        config = black.parse_pyproject_toml(config_path) if config_path else {}
+        if not config.keys() <= _BLACK_API_CONFIG_KEYS:
+            return None
+
+        target_versions = [tool.target_version] if tool.target_version else config.get("target_version", [])
+        mode = black.Mode(
+            target_versions={black.TargetVersion[version.upper()] for version in target_versions},
+            line_length=tool.line_length or config.get("line_length", black.DEFAULT_LINE_LENGTH),
+            string_normalization=not (tool.skip_string_normalization or config.get("skip_string_normalization", False)),
+            is_pyi=path.endswith('.pyi'),
+            magic_trailing_comma=not config.get("skip_magic_trailing_comma", False),
+            preview=config.get("preview", False)
+        )
 
-            if tool.check_only:
-                cmd.append("--check")
+        with open(path, 'rb') as f:
+            mtime = os.fstat(f.fileno()).st_mtime
+            src, encoding, newline = black.decode_bytes(f.read())
+        try:
+            dst = black.format_file_contents(src, fast=False, mode=mode)
+        except black.NothingChanged:
+            dst = src
+    except Exception:
+        # Unknown target version, syntax error, ...: the CLI reports these
+        return None
+
+    changed = dst != src
+    would = tool.check_only or tool.diff
+    stdout = ""
+    if changed and tool.diff:
+        then = datetime.fromtimestamp(mtime, timezone.utc)
+        now = datetime.now(timezone.utc)
+        stdout = black.diff(src, dst, f"{target}\t{then}", f"{target}\t{now}")
+    elif changed and not tool.check_only:
+        with open(path, 'w', encoding=encoding, newline=newline) as f:
+            f.write(dst)
+
+    returncode = 1 if changed and tool.check_only else 0
+    stderr_lines = []
+    if changed:
+        stderr_lines.append(f"{'would reformat' if would else 'reformatted'} {target}")
+        stderr_lines.append("")
+    stderr_lines.append("Oh no! 💥 💔 💥" if returncode else "All done! ✨ 🍰 ✨")
+    if changed:
+        stderr_lines.append("1 file would be reformatted." if would else "1 file reformatted.")
+    else:
+        stderr_lines.append("1 file would be left unchanged." if would else "1 file left unchanged.")
+
+    return subprocess.CompletedProcess(None, returncode, stdout, "\n".join(stderr_lines) + "\n")
 
-            if tool.diff:
-                cmd.append("--diff")
 
-            cmd.append(target)
+@register_tool("Format")
+async def execute_format(tool: types.FormatTool, working_dir: str = ".") -> str:
+    """Run code formatting with Black"""
+    formatter = "black"
+    try:
+        target = tool.target_path or "."
 
-        elif formatter == "black":
-            cmd = ["black"]
+        cmd = ["black"]
 
-            if tool.check_only:
-                cmd.append("--check")
+        if tool.check_only:
+            cmd.append("--check")
 
-            if tool.diff:
-                cmd.append("--diff")
+        if tool.diff:
+            cmd.append("--diff")
 
-            if tool.line_length:
-                cmd.extend(["--line-length", str(tool.line_length)])
+        if tool.line_length:
+            cmd.extend(["--line-length", str(tool.line_length)])
 
-            cmd.append(target)
+        if tool.skip_string_normalization:
+            cmd.append("--skip-string-normalization")
 
-        else:
-            return f"Error: Unknown formatter '{formatter}'. Use 'ruff' or 'black'"
+        if tool.target_version:
+            cmd.extend(["--target-version", tool.target_version])
 
-        # Execute formatter
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60,
-            cwd=working_dir
-        )
+        cmd.append(target)
+
+        # Keep only the lines that can be displayed. A single file is
+        # formatted in-process when black is importable here.
+        stdout_window = OutputWindow(limit=30, head=25, tail=5)
+        result = await asyncio.to_thread(_format_with_black_api, tool, target, working_dir)
+        if result is not None:
+            for line in result.stdout.split('\n'):
+                stdout_window.add(line)
+        else:
+            result = await stream_subprocess(
+                cmd,
+                stdout_window.add,
+                timeout=60,
+                cwd=working_dir
+            )
 
         # Format output
         output_lines = []
@@ -353,23 +486,23 @@ def execute_format(tool: types.FormatTool, working_dir: str = ".") -> str:
             else:
                 output_lines.append("✅ Code has been formatted successfully")
 
-            if result.stdout:
+            if stdout_window.total:
                 output_lines.append("Details:")
-                output_lines.append(result.stdout.strip())
+                output_lines.extend(stdout_window.head)
+                if stdout_window.truncated:
+                    output_lines.append(f"... [Truncated: showing first 25 of {stdout_window.total} lines]")
+                    output_lines.extend(stdout_window.tail)
         else:
             if tool.check_only:
                 output_lines.append("⚠️  Code formatting issues detected:")
             else:
                 output_lines.append("⚠️  Formatting completed with issues:")
 
-            if result.stdout:
-                stdout_lines = result.stdout.strip().split('\n')
-                if len(stdout_lines) > 30:
-                    output_lines.extend(stdout_lines[:25])
-                    output_lines.append(f"\n... [Truncated: showing first 25 of {len(stdout_lines)} lines]")
-                    output_lines.extend(stdout_lines[-5:])
-                else:
-                    output_lines.extend(stdout_lines)
+            if stdout_window.total:
+                output_lines.extend(stdout_window.head)
+                if stdout_window.truncated:
+                    output_lines.append(f"\n... [Truncated: showing first 25 of {stdout_window.total} lines]")
+                    output_lines.extend(stdout_window.tail)
 
         if result.stderr:
             output_lines.append("\nErrors:")
@@ -387,108 +520,213 @@ def execute_format(tool: types.FormatTool, working_dir: str = ".") -> str:
         return f"Error running {formatter}: {str(e)}"
 
 
-@register_tool("Dependency")
-def execute_dependency(tool: types.DependencyTool, working_dir: str = ".") -> str:
-    """Check and manage Python dependencies"""
+def _module_available(name: str) -> bool:
+    """Whether a module can be located on sys.path, without executing it"""
     try:
-        check_type = tool.check_type or "imports"
-        packages = tool.packages or []
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # Missing parent package, or not a valid module name
+        return False
 
-        output_lines = []
-        output_lines.append(f"Dependency Check: {check_type}")
-        output_lines.append("")
 
-        if check_type == "imports":
-            # Check if packages can be imported
-            if not packages:
-                return "Error: No packages specified for import check"
-
-            import_results = []
-            for package in packages:
-                try:
-                    __import__(package)
-                    import_results.append(f"✅ {package}: Available")
-                except ImportError:
-                    import_results.append(f"❌ {package}: Not available")
-
-            output_lines.append("Import Check Results:")
-            output_lines.extend(import_results)
-
-        elif check_type == "list" or check_type == "missing":
-            # List installed packages
-            result = subprocess.run(
-                ["pip", "list"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=working_dir
-            )
+@functools.lru_cache(maxsize=16)
+def _parse_declared_dependencies(path: str, mtime_ns: int, include_optional: bool) -> tuple[tuple[str, str], ...]:
+    """
+    Distribution names listed in a pyproject.toml's [project] dependencies,
+    and optionally its optional-dependencies groups (each name once).
 
-            if result.returncode == 0:
-                output_lines.append("Installed packages:")
-                output_lines.append(result.stdout.strip())
-            else:
-                output_lines.append("Failed to list packages")
-                output_lines.append(result.stderr.strip())
+    The modification time is part of the cache key, so an unchanged file is
+    parsed (and its names normalized) once while edits are picked up on the
+    next call.
 
-        elif check_type == "outdated":
-            # Check for outdated packages
-            result = subprocess.run(
-                ["pip", "list", "--outdated"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=working_dir
-            )
+    Returns:
+        Tuples of (name as written, normalized name)
+    """
+    try:
+        import tomllib
+    except ImportError:
+        # Python 3.10
+        import tomli as tomllib  # type: ignore
+
+    with open(path, 'rb') as f:
+        project = tomllib.load(f).get("project", {})
+
+    requirements = project.get("dependencies", [])
+    if include_optional:
+        requirements = chain(
+            requirements,
+            chain.from_iterable(project.get("optional-dependencies", {}).values())
+        )
 
-            if result.returncode == 0:
-                output_lines.append("Outdated packages:")
-                output_lines.append(result.stdout.strip())
-            else:
-                output_lines.append("Failed to check outdated packages")
-                output_lines.append(result.stderr.strip())
+    names = {}
+    for requirement in requirements:
+        match = _REQUIREMENT_NAME_RE.match(requirement)
+        if match:
+            name = match.group(1)
+            names.setdefault(_normalize_distribution_name(name), name)
+    return tuple((name, normalized) for normalized, name in names.items())
+
+
+def _declared_dependencies(working_dir: str, include_optional: bool = False) -> Optional[tuple[tuple[str, str], ...]]:
+    """
+    Dependencies declared in working_dir's pyproject.toml.
+
+    Args:
+        working_dir: Directory containing the pyproject.toml
+        include_optional: Also include the optional-dependencies groups
+
+    Returns:
+        (name, normalized name) tuples, or None if there is no pyproject.toml
+        or no TOML parser is available
+    """
+    path = os.path.join(working_dir, "pyproject.toml")
+    try:
+        return _parse_declared_dependencies(path, os.stat(path).st_mtime_ns, include_optional)
+    except (OSError, ImportError):
+        return None
+
+
+def _normalize_distribution_name(name: str) -> str:
+    """PEP 503 normalized form of a distribution name (e.g. Foo_Bar -> foo-bar)"""
+    return _DISTRIBUTION_NAME_SEPARATORS_RE.sub("-", name).lower()
+
+
+def _installed_distributions() -> set[str]:
+    """
+    Normalized names of all installed distributions.
+
+    One pass over the metadata directories on sys.path, instead of a separate
+    sys.path search per looked-up package.
+    """
+    return {
+        _normalize_distribution_name(dist.metadata["Name"] or "")
+        for dist in importlib.metadata.distributions()
+    }
+
+
+def _check_imports(packages: list[str]) -> list[str]:
+    """Report whether each package can be imported"""
+    # Locate the modules concurrently: find_spec mostly waits on
+    # filesystem stats (which release the GIL) and, unlike importing,
+    # doesn't run each package's initialization code. A name given more than
+    # once is only looked up once.
+    unique_packages = list(dict.fromkeys(packages))
+    with ThreadPoolExecutor(max_workers=min(32, len(unique_packages))) as executor:
+        available = dict(zip(unique_packages, executor.map(_module_available, unique_packages)))
+
+    output_lines = ["Import Check Results:"]
+    output_lines.extend(
+        f"✅ {package}: Available" if available[package] else f"❌ {package}: Not available"
+        for package in packages
+    )
+    return output_lines
 
-        elif check_type == "tree":
-            # Show dependency tree (simplified)
-            output_lines.append("Dependency tree check not implemented yet")
 
+async def _check_pip_list(args: list[str], title: str, failure: str, working_dir: str) -> list[str]:
+    """Run a pip list variant and report its output"""
+    result = await run_subprocess(["pip", "list", *args], timeout=30, cwd=working_dir)
+
+    if result.returncode == 0:
+        return [title, result.stdout.strip()]
+    return [failure, result.stderr.strip()]
+
+
+async def _run_dependency_check(check_type: str, tool: types.DependencyTool, working_dir: str) -> list[str]:
+    """Output lines for a single dependency check"""
+    output_lines = [f"Dependency Check: {check_type}", ""]
+
+    if check_type == "imports":
+        output_lines.extend(await asyncio.to_thread(_check_imports, tool.packages))
+
+    elif check_type == "missing" and (declared := _declared_dependencies(working_dir, bool(tool.include_dev))) is not None:
+        # Compare pyproject.toml's declared dependencies with what's installed
+        installed = await asyncio.to_thread(_installed_distributions)
+        missing = [name for name, normalized in declared if normalized not in installed]
+
+        source = "pyproject.toml, with optional dependencies" if tool.include_dev else "pyproject.toml"
+        output_lines.append(f"Declared dependencies ({source}): {len(declared)}")
+        if missing:
+            output_lines.append(f"Missing packages ({len(missing)}):")
+            output_lines.extend(f"❌ {name}" for name in missing)
         else:
-            return f"Error: Unknown check_type '{check_type}'. Use 'imports', 'list', 'missing', 'outdated', or 'tree'"
+            output_lines.append("✅ All declared dependencies are installed")
 
-        return "\n".join(output_lines)
+    elif check_type == "list" or check_type == "missing":
+        output_lines.extend(await _check_pip_list(
+            [], "Installed packages:", "Failed to list packages", working_dir
+        ))
+
+    elif check_type == "outdated":
+        output_lines.extend(await _check_pip_list(
+            ["--outdated"], "Outdated packages:", "Failed to check outdated packages", working_dir
+        ))
+
+    elif check_type == "tree":
+        # Show dependency tree (simplified)
+        output_lines.append("Dependency tree check not implemented yet")
+
+    return output_lines
+
+
+@register_tool("Dependency")
+async def execute_dependency(tool: types.DependencyTool, working_dir: str = ".") -> str:
+    """Check and manage Python dependencies"""
+    try:
+        # Several checks can be requested at once, comma-separated
+        # (e.g. "missing,outdated"); they run concurrently and are reported
+        # in the order given
+        check_types = [name.strip() for name in (tool.check_type or "imports").split(",") if name.strip()]
+        packages = tool.packages or []
+
+        for check_type in check_types:
+            if check_type not in _DEPENDENCY_CHECK_TYPES:
+                return f"Error: Unknown check_type '{check_type}'. Use 'imports', 'list', 'missing', 'outdated', or 'tree'"
+        if "imports" in check_types and not packages:
+            return "Error: No packages specified for import check"
+
+        sections = await asyncio.gather(*(
+            _run_dependency_check(check_type, tool, working_dir)
+            for check_type in check_types
+        ))
+
+        return "\n\n".join("\n".join(section) for section in sections)
 
     except Exception as e:
         return f"Error checking dependencies: {str(e)}"
 
 
 @register_tool("GitDiff")
-def execute_git_diff(tool: types.GitDiffTool, working_dir: str = ".") -> str:
+async def execute_git_diff(tool: types.GitDiffTool, working_dir: str = ".") -> str:
     """View git diff information"""
     try:
         cmd = ["git", "diff"]
 
         # Add options based on tool parameters
-        if tool.cached:
+        if tool.staged:
             cmd.append("--cached")
 
-        if tool.name_only:
-            cmd.append("--name-only")
-
         if tool.stat:
             cmd.append("--stat")
 
-        if tool.no_color:
-            cmd.append("--no-color")
+        if tool.context_lines is not None:
+            cmd.append(f"--unified={tool.context_lines}")
+
+        if tool.ignore_whitespace:
+            cmd.append("--ignore-all-space")
 
-        # Add file paths if specified
-        if tool.paths:
-            cmd.extend(tool.paths)
+        if tool.reference:
+            cmd.append(tool.reference)
 
-        # Execute git diff
-        result = subprocess.run(
+        # Limit the diff to a path if specified
+        if tool.target_path:
+            cmd.extend(["--", tool.target_path])
+
+        # Execute git diff, streaming the output so a huge diff only ever
+        # holds the lines that will be shown
+        stdout_window = OutputWindow(limit=200, head=150, tail=20)
+        result = await stream_subprocess(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout_window.add,
             timeout=30,
             cwd=working_dir
         )
@@ -500,17 +738,13 @@ def execute_git_diff(tool: types.GitDiffTool, working_dir: str = ".") -> str:
         output_lines.append("")
 
         if result.returncode == 0:
-            if result.stdout:
-                stdout_lines = result.stdout.strip().split('\n')
-
+            if stdout_window.total:
                 # Truncate very large diffs
-                if len(stdout_lines) > 200:
-                    output_lines.extend(stdout_lines[:150])
-                    output_lines.append(f"\n... [Diff truncated: showing first 150 of {len(stdout_lines)} lines]")
-                    output_lines.append("Use GitDiff with specific paths or --name-only for focused view")
-                    output_lines.extend(stdout_lines[-20:])
-                else:
-                    output_lines.extend(stdout_lines)
+                output_lines.extend(stdout_window.head)
+                if stdout_window.truncated:
+                    output_lines.append(f"\n... [Diff truncated: showing first 150 of {stdout_window.total} lines]")
+                    output_lines.append("Use GitDiff with target_path or stat=true for a focused view")
+                    output_lines.extend(stdout_window.tail)
             else:
                 output_lines.append("No differences found")
         else:
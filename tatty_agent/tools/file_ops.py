@@ -7,12 +7,208 @@ This module contains all file-related tools extracted from main.py:
 - MultiEdit: Apply multiple edits to a single file
 - Write: Write content to files
 """
+import itertools
+import mmap
 import os
+import secrets
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterable, Optional
 
 from ..baml_client import types
 from .registry import register_tool
 
+# Files larger than this are read through an mmap with sequential-access advice
+_MMAP_READ_THRESHOLD = 8 << 20
+
+# Characters of Read output kept in memory across calls, and the largest single
+# output worth caching (bigger windows are formatted again on every read)
+_READ_CACHE_MAX_CHARS = 4 << 20
+_READ_CACHE_ENTRY_MAX_CHARS = 256 << 10
+
+# Flags for creating a temporary file next to a write target, as mkstemp uses
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_NOFOLLOW', 0)
+
+
+def _read_window(lines: Iterable, start: int, end: int) -> tuple[list, int]:
+    """
+    Collect lines [start, end) from a line iterator without materializing the rest.
+
+    Lines after the window are only counted, so memory stays bounded by the
+    window size regardless of file size.
+
+    Returns:
+        Tuple of (window lines, total line count)
+    """
+    lines = iter(lines)
+    skipped = sum(1 for _ in itertools.islice(lines, start))
+    window = list(itertools.islice(lines, end - start))
+    remaining = sum(1 for _ in lines)
+    return window, skipped + len(window) + remaining
+
+
+def _read_window_mmap(path: str, start: int, end: int) -> tuple[list[str], int]:
+    """
+    Read lines [start, end) of a large file via mmap.
+
+    Sequential advice lets the kernel read ahead aggressively and drop pages
+    behind the cursor. Only lines inside the window are decoded.
+
+    Returns:
+        Tuple of (window lines, total line count)
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+            window, total_lines = _read_window(iter(mm.readline, b""), start, end)
+    return [line.decode('utf-8') for line in window], total_lines
+
+
+def _create_temp(directory: str) -> tuple[int, str]:
+    """
+    Create a uniquely named temporary file in directory, open for writing.
+
+    Unlike mkstemp's 0600 file, it is created with mode 0666, so the kernel
+    applies the process umask just as for any newly created file.
+
+    Returns:
+        Tuple of (file descriptor, path)
+    """
+    while True:
+        name = os.path.join(directory, f".tatty-{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(name, _TEMP_FLAGS, 0o666), name
+        except FileExistsError:
+            continue
+
+
+def _write_atomic(path: Path, chunks: Iterable[str]) -> None:
+    """
+    Write text to path atomically via a temporary file and os.replace.
+
+    The content is written next to the target, fsynced, and renamed over it, so
+    readers never observe a partially written file. Chunks are written as they
+    are produced, letting callers avoid building the whole output string.
+
+    Args:
+        path: Destination file; symlinks are written through to their target
+        chunks: Pieces of text to write in order
+    """
+    target = os.path.realpath(path)
+    fd, tmp_name = _create_temp(os.path.dirname(target))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp:
+            for chunk in chunks:
+                tmp.write(chunk)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        # Keep the original file's permissions; a new file keeps its umask-based mode
+        try:
+            os.chmod(tmp_name, os.stat(target).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class _OutputCache:
+    """
+    LRU cache of tool outputs, bounded by their total length.
+
+    A plain lru_cache bounds the number of entries only, and a single Read
+    window can be megabytes long. Outputs above `entry_max` characters are
+    not cached at all. Read runs in worker threads, so access is locked.
+    """
+
+    def __init__(self, max_chars: int, entry_max: int):
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._chars = 0
+        self._max_chars = max_chars
+        self._entry_max = entry_max
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[str]:
+        """Cached output for key, or None"""
+        with self._lock:
+            output = self._entries.get(key)
+            if output is not None:
+                self._entries.move_to_end(key)
+            return output
+
+    def put(self, key: tuple, output: str) -> None:
+        """Cache output, evicting the least recently used entries over budget"""
+        if len(output) > self._entry_max:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous)
+            self._entries[key] = output
+            self._chars += len(output)
+            while self._chars > self._max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+_READ_CACHE = _OutputCache(_READ_CACHE_MAX_CHARS, _READ_CACHE_ENTRY_MAX_CHARS)
+
+
+def _read_formatted(path: str, start: int, end: int, mtime_ns: int, size: int, inode: int) -> str:
+    """
+    Read tool output for lines [start, end) of a file, cached.
+
+    The file's modification time, size and inode are part of the cache key,
+    so re-reading an unchanged file (common across agent iterations) is
+    served from memory, while any write, including an atomic replace, is
+    picked up on the next call.
+    """
+    key = (path, start, end, mtime_ns, size, inode)
+    output = _READ_CACHE.get(key)
+    if output is None:
+        output = _format_window(path, start, end, size)
+        _READ_CACHE.put(key, output)
+    return output
+
+
+def _format_window(path: str, start: int, end: int, size: int) -> str:
+    """Read and format lines [start, end) of a file of the given size"""
+    # madvise is unavailable on Windows
+    if hasattr(mmap, 'MADV_SEQUENTIAL') and size > _MMAP_READ_THRESHOLD:
+        window, total_lines = _read_window_mmap(path, start, end)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            window, total_lines = _read_window(f, start, end)
+
+    if not window:
+        return "Empty file"
+
+    # Format the whole window in one join; very long lines are truncated
+    # at 20k characters
+    output = "\n".join(
+        f"{i:6d}|{line.rstrip() if len(line) <= 20000 else line[:20000] + '... [line truncated at 20k characters]'}"
+        for i, line in enumerate(window, start=start + 1)
+    )
+
+    # Add truncation notice if we hit the limit
+    if end < total_lines:
+        remaining = total_lines - end
+        output += f"\n\n\n... [Output truncated: showing lines {start + 1}-{end} of {total_lines} total lines ({remaining} lines remaining)]\n"
+        output += f"To read more, use the Read tool with: offset={end}, limit={min(5000, remaining)}"
+
+    return output
+
 
 @register_tool("Read")
 def execute_read(tool: types.ReadTool, working_dir: str = ".") -> str:
@@ -24,36 +220,18 @@ def execute_read(tool: types.ReadTool, working_dir: str = ".") -> str:
         else:
             path = Path(tool.file_path)
 
-        if not path.exists():
+        try:
+            st = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
             return f"File not found: {tool.file_path}"
 
-        with open(path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        total_lines = len(lines)
         start = tool.offset if tool.offset else 0
-        end = start + tool.limit if tool.limit else len(lines)
 
         # Limit to 5000 lines per read
         max_lines = 5000
-        if end - start > max_lines:
-            end = start + max_lines
-
-        result_lines = []
-        for i, line in enumerate(lines[start:end], start=start + 1):
-            # Truncate very long lines at 20k characters
-            if len(line) > 20000:
-                line = line[:20000] + "... [line truncated at 20k characters]\n"
-            result_lines.append(f"{i:6d}|{line.rstrip()}")
-
-        # Add truncation notice if we hit the limit
-        if end < total_lines:
-            remaining = total_lines - end
-            truncation_notice = f"\n\n... [Output truncated: showing lines {start + 1}-{end} of {total_lines} total lines ({remaining} lines remaining)]\n"
-            truncation_notice += f"To read more, use the Read tool with: offset={end}, limit={min(5000, remaining)}"
-            result_lines.append(truncation_notice)
-
-        return "\n".join(result_lines) if result_lines else "Empty file"
+        end = start + min(tool.limit, max_lines) if tool.limit else start + max_lines
+
+        return _read_formatted(os.path.abspath(path), start, end, st.st_mtime_ns, st.st_size, st.st_ino)
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
@@ -74,20 +252,31 @@ def execute_edit(tool: types.EditTool, working_dir: str = ".") -> str:
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
 
+        idx = content.find(tool.old_string)
+        if idx < 0:
+            return "Error: old_string not found in file"
+
         if tool.replace_all:
-            new_content = content.replace(tool.old_string, tool.new_string)
-            count = content.count(tool.old_string)
+            replaced = content.replace(tool.old_string, tool.new_string)
+            growth = len(tool.new_string) - len(tool.old_string)
+            # Every replacement changes the length by the same amount, so the
+            # count falls out of the size difference without another scan
+            count = (len(replaced) - len(content)) // growth if growth else content.count(tool.old_string)
+            new_content = (replaced,)
         else:
-            if content.count(tool.old_string) > 1:
+            # A second (non-overlapping) hit past the first means the edit is
+            # ambiguous; only then is it worth a full count for the error message
+            if content.find(tool.old_string, idx + max(len(tool.old_string), 1)) != -1:
                 return f"Error: old_string is not unique in file (found {content.count(tool.old_string)} occurrences)"
-            new_content = content.replace(tool.old_string, tool.new_string, 1)
-            count = 1 if tool.old_string in content else 0
-
-        if count == 0:
-            return "Error: old_string not found in file"
+            count = 1
+            # Stream the spliced file out piecewise instead of concatenating it
+            new_content = (
+                content[:idx],
+                tool.new_string,
+                content[idx + len(tool.old_string):]
+            )
 
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        _write_atomic(path, new_content)
 
         return f"Successfully edited {tool.file_path} ({count} replacement(s))"
     except Exception as e:
@@ -110,19 +299,22 @@ def execute_multi_edit(tool: types.MultiEditTool, working_dir: str = ".") -> str
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Apply edits sequentially
+        # Apply edits sequentially. Each edit sees the result of the previous
+        # ones, so they cannot in general be fused into one multi-pattern scan;
+        # str.find/str.replace use CPython's fast substring search, which
+        # outperforms a combined re alternation over the same content.
         for i, edit in enumerate(tool.edits):
             if edit.replace_all:
                 content = content.replace(edit.old_string, edit.new_string)
             else:
-                if content.count(edit.old_string) > 1:
+                idx = content.find(edit.old_string)
+                if idx != -1 and content.find(edit.old_string, idx + max(len(edit.old_string), 1)) != -1:
                     return f"Error in edit {i+1}: old_string is not unique (found {content.count(edit.old_string)} occurrences)"
-                if edit.old_string not in content:
+                if idx < 0:
                     return f"Error in edit {i+1}: old_string not found"
-                content = content.replace(edit.old_string, edit.new_string, 1)
+                content = content[:idx] + edit.new_string + content[idx + len(edit.old_string):]
 
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        _write_atomic(path, (content,))
 
         return f"Successfully applied {len(tool.edits)} edits to {tool.file_path}"
     except Exception as e:
@@ -142,8 +334,7 @@ def execute_write(tool: types.WriteTool, working_dir: str = ".") -> str:
         # Create parent directories if they don't exist
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(tool.content)
+        _write_atomic(path, (tool.content,))
 
         return f"Successfully wrote {tool.file_path}"
     except Exception as e:
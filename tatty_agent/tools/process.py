@@ -0,0 +1,300 @@
+"""
+Subprocess helpers for TATty Agent tools
+
+Tools that shell out (rg, ruff, mypy, pytest, ...) use these coroutines instead
+of blocking subprocess.run calls, so the agent's event loop keeps running while
+a command executes and concurrent tool calls can overlap.
+"""
+import asyncio
+import codecs
+import os
+import signal
+import subprocess
+from collections import deque
+from typing import Callable, Optional, Union
+
+# Children get their own process group (and can be killed as one) on POSIX
+_POSIX = os.name == 'posix'
+
+# Bytes read from a streamed stdout pipe at a time
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Seconds a killed child's pipes are drained before they are closed instead
+_DRAIN_TIMEOUT = 5.0
+
+
+class OutputWindow:
+    """
+    Bounded view of a command's output lines.
+
+    Keeps up to `limit` lines from the start plus the last `tail` lines, so
+    memory stays constant however much a command prints. Leading and trailing
+    blank lines are dropped, like str.strip() on the whole output.
+    """
+
+    def __init__(self, limit: int, head: int, tail: int):
+        """
+        Args:
+            limit: Number of lines shown in full before output counts as truncated
+            head: Lines shown from the start when truncated
+            tail: Lines shown from the end when truncated
+        """
+        self.total = 0
+        self._limit = limit
+        self._head_size = head
+        self._first: list[str] = []
+        self._last: deque[str] = deque(maxlen=tail)
+        self._blank: list[str] = []
+
+    def add(self, line: str) -> None:
+        """Record one output line"""
+        if not line.strip():
+            # Blank lines only count once more output follows them
+            if self.total:
+                self._blank.append(line)
+            return
+
+        for blank in self._blank:
+            self._append(blank)
+        self._blank.clear()
+        self._append(line)
+
+    def _append(self, line: str) -> None:
+        if not self.total:
+            line = line.lstrip()
+        self.total += 1
+        if len(self._first) < self._limit:
+            self._first.append(line)
+        self._last.append(line)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the output had more than `limit` lines"""
+        return self.total > self._limit
+
+    @property
+    def head(self) -> list[str]:
+        """All lines, or only the first `head` lines if truncated"""
+        if self.truncated:
+            return self._first[:self._head_size]
+        return _rstrip_last(self._first)
+
+    @property
+    def tail(self) -> list[str]:
+        """The last `tail` lines if truncated, otherwise nothing"""
+        return _rstrip_last(list(self._last)) if self.truncated else []
+
+
+def _rstrip_last(lines: list[str]) -> list[str]:
+    """Copy of lines with trailing whitespace removed from the final line"""
+    return lines[:-1] + [lines[-1].rstrip()] if lines else lines
+
+
+def first_lines(text: str, count: int) -> str:
+    """
+    The first `count` lines of text, as one string.
+
+    Finds the cut point with str.find instead of splitting the whole text into
+    a list of lines.
+    """
+    if count <= 0:
+        return ""
+    end = -1
+    for _ in range(count):
+        end = text.find('\n', end + 1)
+        if end < 0:
+            return text
+    return text[:end]
+
+
+async def run_subprocess(
+    cmd: Union[list[str], str],
+    timeout: Optional[float] = None,
+    cwd: Optional[str] = None,
+    shell: bool = False,
+    max_output: Optional[int] = None
+) -> subprocess.CompletedProcess:
+    """
+    Run a command without blocking the event loop.
+
+    On POSIX the command runs in its own process group so that a kill also
+    reaches anything it spawned (e.g. the children of a shell command).
+
+    Behaves like subprocess.run(cmd, capture_output=True, text=True): raises
+    FileNotFoundError when the executable is missing and subprocess.TimeoutExpired
+    (after killing the process) when the timeout elapses. Completion is delivered
+    by the event loop's child watcher, so nothing polls the process.
+
+    If the awaiting task is cancelled (e.g. the agent run is interrupted with
+    Ctrl-C), the child is killed before the cancellation propagates.
+
+    With max_output set, each of stdout and stderr keeps only its first
+    max_output bytes (plus a truncation notice) while the rest is read and
+    dropped, so a command that prints without bound cannot exhaust memory.
+
+    Args:
+        cmd: Command and arguments, or a command string when shell is True
+        timeout: Timeout in seconds, or None to wait indefinitely
+        cwd: Working directory for the command
+        shell: Run cmd through the system shell
+        max_output: Bytes of stdout and of stderr to keep, or None for all
+
+    Returns:
+        CompletedProcess with decoded stdout and stderr
+    """
+    if shell:
+        proc = await asyncio.create_subprocess_shell(
+            cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            start_new_session=_POSIX
+        )
+    else:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            start_new_session=_POSIX
+        )
+
+    if max_output is None:
+        communicate = proc.communicate()
+    else:
+        communicate = _communicate_capped(proc, max_output)
+
+    try:
+        stdout, stderr = await asyncio.wait_for(communicate, timeout)
+    except asyncio.TimeoutError:
+        await _kill(proc)
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except asyncio.CancelledError:
+        await _kill(proc)
+        raise
+
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout.decode('utf-8', errors='replace'),
+        stderr.decode('utf-8', errors='replace')
+    )
+
+
+async def _read_capped(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """Read a pipe to EOF, keeping its first `limit` bytes"""
+    kept = bytearray()
+    total = 0
+    while chunk := await stream.read(_STREAM_CHUNK_SIZE):
+        total += len(chunk)
+        if len(kept) < limit:
+            kept += chunk[:limit - len(kept)]
+    if total > limit:
+        kept += f"\n... [output truncated: showing first {limit} of {total} bytes]".encode()
+    return bytes(kept)
+
+
+async def _communicate_capped(proc: asyncio.subprocess.Process, limit: int) -> tuple[bytes, bytes]:
+    """Like proc.communicate(), but keeping at most `limit` bytes per stream"""
+    stdout, stderr = await asyncio.gather(
+        _read_capped(proc.stdout, limit),
+        _read_capped(proc.stderr, limit)
+    )
+    await proc.wait()
+    return stdout, stderr
+
+
+async def stream_subprocess(
+    cmd: list[str],
+    on_line: Callable[[str], None],
+    timeout: Optional[float] = None,
+    cwd: Optional[str] = None
+) -> subprocess.CompletedProcess:
+    """
+    Run a command, passing each line of its stdout to on_line as it arrives.
+
+    stdout is never held in memory as a whole, so callers can keep bounded
+    summaries (see OutputWindow) of arbitrarily long output. Missing
+    executables, timeouts and cancellation behave as in run_subprocess.
+
+    Args:
+        cmd: Command and arguments
+        on_line: Called with each decoded stdout line, without its newline
+        timeout: Timeout in seconds, or None to wait indefinitely
+        cwd: Working directory for the command
+
+    Returns:
+        CompletedProcess with stdout=None and decoded stderr
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        start_new_session=_POSIX
+    )
+
+    async def pump() -> bytes:
+        # Drain stderr concurrently so a chatty stderr cannot block the child
+        stderr_task = asyncio.ensure_future(proc.stderr.read())
+        try:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            partial = ""
+            while chunk := await proc.stdout.read(_STREAM_CHUNK_SIZE):
+                *lines, partial = (partial + decoder.decode(chunk)).split('\n')
+                for line in lines:
+                    on_line(line)
+            partial += decoder.decode(b"", final=True)
+            if partial:
+                on_line(partial)
+            stderr = await stderr_task
+        finally:
+            stderr_task.cancel()
+        await proc.wait()
+        return stderr
+
+    try:
+        stderr = await asyncio.wait_for(pump(), timeout)
+    except asyncio.TimeoutError:
+        await _kill(proc)
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except BaseException:
+        # Cancelled, or on_line raised: don't leave the child running
+        await _kill(proc)
+        raise
+
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        None,
+        stderr.decode('utf-8', errors='replace')
+    )
+
+
+async def _kill(proc: asyncio.subprocess.Process) -> None:
+    """Kill a child process and its process group, then reap it"""
+    try:
+        if _POSIX:
+            os.killpg(proc.pid, signal.SIGKILL)
+        elif proc.returncode is None:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+    # Drain what is left in the pipes rather than just wait(): a transport
+    # paused on a full, unread buffer never sees EOF, and wait() would block
+    # forever on a chatty command
+    try:
+        await asyncio.wait_for(proc.communicate(), _DRAIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        # A grandchild that left the process group still holds the pipes open,
+        # so EOF never comes. Closing the subprocess transport closes our ends
+        # of them (asyncio's wait() also blocks until they are closed, uvloop's
+        # does not). Process has no public accessor for its transport; the
+        # attribute was verified with CPython 3.11's asyncio and uvloop 0.23
+        transport = getattr(proc, '_transport', None)
+        if transport is None:
+            # Don't wait on the open pipes; the loop's child watcher still
+            # reaps the killed child
+            return
+        transport.close()
+        await proc.wait()
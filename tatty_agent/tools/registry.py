@@ -5,11 +5,27 @@ This module centralizes tool registration and execution, providing a clean
 interface for the agent runtime to execute tools without tight coupling.
 """
 from typing import Dict, Callable, Awaitable, Union
+import asyncio
 import inspect
+from concurrent.futures import ThreadPoolExecutor
 
 from ..baml_client import types
+from ..core.runtime import AgentRuntime
 from ..core.types import ToolExecutor
 
+# Synchronous read-only tools that run in a worker thread, so reading a large
+# file or directory doesn't stall the event loop (UI callbacks, streaming,
+# other agents sharing the loop). Tools that modify files stay inline.
+# ArtifactManagement only ever creates the standard folders, but walks and
+# hashes whole artifact trees.
+_THREADED_TOOLS = frozenset({"Read", "LS", "NotebookRead", "ArtifactManagement"})
+
+# Filesystem tools get their own pool rather than the loop's default
+# executor, where WebFetch and WebSearch wait on the network, so slow web
+# requests can't queue a file read behind them. Threads are only started when
+# first needed.
+_FS_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tatty-fs")
+
 
 class ToolRegistry:
     """Registry for tool handlers with dynamic discovery and execution"""
@@ -31,28 +47,27 @@ class ToolRegistry:
 
     async def execute(self, tool: types.AgentTools, working_dir: str = ".") -> str:
         """Execute a tool based on its action type"""
-        # Check for global interrupt state if available
-        try:
-            from ..core.runtime import AgentRuntime
-            if hasattr(AgentRuntime, '_current_state') and AgentRuntime._current_state:
-                if AgentRuntime._current_state.interrupt_requested:
-                    return "❌ Tool execution interrupted by user"
-        except:
-            pass  # No interrupt checking available
+        # Check for global interrupt state
+        state = AgentRuntime._current_state
+        if state is not None and state.interrupt_requested:
+            return "❌ Tool execution interrupted by user"
 
         action = tool.action
 
-        # Check async tools first
-        if action in self._async_tools:
-            handler = self._async_tools[action]
+        # Check async tools first (one hash lookup per table)
+        handler = self._async_tools.get(action)
+        if handler is not None:
             return await handler(tool, working_dir)
 
         # Check sync tools
-        if action in self._tools:
-            handler = self._tools[action]
-            return handler(tool, working_dir)
-
-        return f"Unknown tool type: {action}"
+        handler = self._tools.get(action)
+        if handler is None:
+            return f"Unknown tool type: {action}"
+
+        if action in _THREADED_TOOLS:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_FS_EXECUTOR, handler, tool, working_dir)
+        return handler(tool, working_dir)
 
 
 # Global registry instance
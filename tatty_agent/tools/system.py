@@ -4,30 +4,37 @@ System tools for TATty Agent
 This module contains system-related tools extracted from main.py:
 - Bash: Execute shell commands with timeout
 - Glob: Find files matching glob patterns
-- Grep: Search for patterns in files using ripgrep
+- Grep: Search for patterns in files using ripgrep (in-process fallback)
 - LS: List directory contents with filtering
 """
+import asyncio
 import subprocess
 import os
+import re
 import glob as glob_module
 import fnmatch
+import functools
 from pathlib import Path
+from typing import Iterator, Optional
 
 from ..baml_client import types
+from .process import run_subprocess
 from .registry import register_tool
 
+# Bytes of stdout (and of stderr) a Bash command may return to the agent
+_BASH_OUTPUT_LIMIT = 64 * 1024
+
 
 @register_tool("Bash")
-def execute_bash(tool: types.BashTool, working_dir: str = ".") -> str:
+async def execute_bash(tool: types.BashTool, working_dir: str = ".") -> str:
     """Execute a bash command and return the output"""
     try:
-        result = subprocess.run(
+        result = await run_subprocess(
             tool.command,
             shell=True,
-            capture_output=True,
-            text=True,
             timeout=tool.timeout / 1000 if tool.timeout else 120,  # Convert ms to seconds
-            cwd=working_dir
+            cwd=working_dir,
+            max_output=_BASH_OUTPUT_LIMIT
         )
 
         output = result.stdout
@@ -43,94 +50,341 @@ def execute_bash(tool: types.BashTool, working_dir: str = ".") -> str:
         return f"Error executing command: {str(e)}"
 
 
+def _mtime_or_zero(path: str) -> float:
+    """Modification time of a path, or 0 if it cannot be stat'ed (one syscall)"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0
+
+
+def _normalize_paths(paths: list[str], working_dir: str) -> list[str]:
+    """
+    Make paths relative to working_dir where possible.
+
+    Uses pure string arithmetic (no filesystem access). Paths outside
+    working_dir are returned unchanged.
+    """
+    base = os.path.abspath(working_dir)
+    normalized = []
+    for path in paths:
+        try:
+            relative_path = os.path.relpath(path, base)
+        except ValueError:
+            # Different drive on Windows
+            normalized.append(path)
+            continue
+
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            # Outside working_dir, keep the original path
+            normalized.append(path)
+        else:
+            normalized.append(relative_path)
+    return normalized
+
+
+async def _rg_files(pattern: str, search_path: str) -> Optional[list[str]]:
+    """
+    List files under search_path matching a glob with `rg --files`.
+
+    ripgrep walks directories in parallel. It runs inside search_path because
+    --glob is matched relative to ripgrep's working directory, and with
+    --no-ignore so gitignored files are listed just as glob lists them (both
+    skip hidden files).
+
+    Returns:
+        Matching paths under search_path, or None if ripgrep is unavailable,
+        fails or finds nothing
+    """
+    try:
+        result = await _run_rg([
+            "--files", "--no-ignore", "--glob", pattern, "--no-messages",
+            "--threads", str(os.cpu_count() or 1)
+        ], cwd=search_path)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    # Nothing found (exit code 1) is left to glob too, whose matching can
+    # differ from ripgrep's in corner cases
+    if result.returncode != 0:
+        return None
+    return [os.path.join(search_path, path) for path in result.stdout.splitlines()]
+
+
 @register_tool("Glob")
-def execute_glob(tool: types.GlobTool, working_dir: str = ".") -> str:
+async def execute_glob(tool: types.GlobTool, working_dir: str = ".") -> str:
     """Find files matching a glob pattern"""
     try:
         search_path = tool.path if tool.path else working_dir
-        pattern = os.path.join(search_path, tool.pattern) if not tool.pattern.startswith("**/") else tool.pattern
 
-        matches = glob_module.glob(pattern, recursive=True)
+        # A full directory walk hurts most for "**/<name>" patterns. Patterns
+        # with a directory component or an absolute path are left to glob
+        matches = None
+        if tool.pattern.startswith("**/") and "/" not in tool.pattern[3:]:
+            matches = await _rg_files(tool.pattern, search_path)
+        if matches is None:
+            pattern = os.path.join(search_path, tool.pattern)
+            matches = await asyncio.to_thread(glob_module.glob, pattern, recursive=True)
 
         if not matches:
             return f"No files found matching pattern: {tool.pattern}"
 
         # Sort by modification time
-        matches.sort(key=lambda x: os.path.getmtime(x) if os.path.exists(x) else 0, reverse=True)
+        matches.sort(key=_mtime_or_zero, reverse=True)
 
-        # Normalize paths to be relative to working_dir
-        working_dir_path = Path(working_dir).resolve()
-        normalized_matches = []
-        for match in matches[:50]:  # Limit to first 50 matches
-            try:
-                match_path = Path(match).resolve()
-                # Try to make it relative to working_dir
-                try:
-                    relative_path = match_path.relative_to(working_dir_path)
-                    normalized_matches.append(str(relative_path))
-                except ValueError:
-                    # If it can't be made relative, use the absolute path
-                    normalized_matches.append(match)
-            except Exception:
-                # If there's any issue, just use the original path
-                normalized_matches.append(match)
-
-        return "\n".join(normalized_matches)
+        # Normalize paths to be relative to working_dir (limit to first 50 matches)
+        return "\n".join(_normalize_paths(matches[:50], working_dir))
     except Exception as e:
         return f"Error executing glob: {str(e)}"
 
 
+# Include globs that map onto ripgrep's built-in file types. Type filters let rg
+# skip non-matching files by extension without evaluating a glob per path.
+# Note that rg types may cover closely related extensions (e.g. "py" also matches .pyi).
+_RG_TYPES = {
+    "*.py": "py",
+    "*.ipynb": "jupyter",
+    "*.js": "js",
+    "*.ts": "ts",
+    "*.go": "go",
+    "*.rs": "rust",
+    "*.java": "java",
+    "*.md": "markdown",
+    "*.json": "json",
+    "*.toml": "toml",
+    "*.yaml": "yaml",
+    "*.yml": "yaml",
+    "*.html": "html",
+    "*.css": "css",
+    "*.sh": "sh",
+}
+
+# Minimum literal length worth a fixed-string prefilter pass before the full regex
+_PREFILTER_MIN_LITERAL = 4
+
+# Candidate files passed to a single rg invocation in the second pass
+_PREFILTER_BATCH_SIZE = 200
+
+# Characters that stand for themselves when backslash-escaped in a pattern
+_REGEX_METACHARS = frozenset("\\.+*?()|[]{}^$-")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_search_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile a search regex once and reuse it across Grep calls"""
+    return re.compile(pattern)
+
+
+def _iter_search_candidates(search_path: str, include: Optional[str]) -> Iterator[str]:
+    """Yield files under search_path, skipping hidden entries like ripgrep does"""
+    if os.path.isfile(search_path):
+        yield search_path
+        return
+
+    include_regex = re.compile(fnmatch.translate(include)) if include else None
+    # os.walk builds every path by joining onto search_path, so the path
+    # relative to it is a slice rather than an os.path.relpath per file
+    prefix_len = len(os.path.join(search_path, ""))
+    for root, dirs, files in os.walk(search_path):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if name.startswith('.'):
+                continue
+            path = os.path.join(root, name)
+            if include_regex and not (
+                include_regex.match(name)
+                or include_regex.match(path[prefix_len:])
+            ):
+                continue
+            yield path
+
+
+def _search_files_with_matches(pattern: str, search_path: str, include: Optional[str], limit: int) -> list[str]:
+    """
+    In-process equivalent of `rg --files-with-matches`, used when ripgrep is unavailable.
+
+    The compiled pattern is cached across calls and the walk stops as soon as
+    `limit` matching files have been found.
+    """
+    regex = _compile_search_pattern(pattern)
+
+    matches = []
+    for path in _iter_search_candidates(search_path, include):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+
+        # Skip binary files
+        if b'\0' in data[:8192]:
+            continue
+
+        text = data.decode('utf-8', errors='ignore')
+        if any(regex.search(line) for line in text.splitlines()):
+            matches.append(path)
+            if len(matches) >= limit:
+                break
+
+    return matches
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """
+    Return the longest literal substring that every match of a regex must contain.
+
+    Returns None when no literal can be guaranteed (alternation, inline flags,
+    numeric, unicode or unrecognized escapes). Group contents are skipped since groups may be quantified.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return None
+
+    runs = []
+    current = []
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if nxt and nxt in _REGEX_METACHARS:
+                # Escaped metacharacter is a plain literal
+                if depth == 0:
+                    current.append(nxt)
+                i += 2
+                continue
+            if not nxt.isalpha() or nxt in ("x", "u", "U", "N", "g", "p", "P"):
+                # Other punctuation escapes may be assertions (rg reads \< and \>
+                # as word boundaries); numeric and unicode escapes aren't literals
+                return None
+            # Class escapes like \d or \w end the literal run
+            runs.append("".join(current))
+            current = []
+            i += 2
+            continue
+
+        if ch in "?*{":
+            # The preceding character may be absent from a match
+            if current:
+                current.pop()
+            runs.append("".join(current))
+            current = []
+            if ch == "{":
+                close = pattern.find("}", i)
+                i = close if close != -1 else len(pattern)
+        elif ch == "[":
+            runs.append("".join(current))
+            current = []
+            # Skip the character class, allowing a leading ']' and escaped characters
+            i += 1
+            if i < len(pattern) and pattern[i] == "^":
+                i += 1
+            if i < len(pattern) and pattern[i] == "]":
+                i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+        elif ch in ".^$+()":
+            runs.append("".join(current))
+            current = []
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth = max(depth - 1, 0)
+        elif depth == 0:
+            current.append(ch)
+        i += 1
+
+    runs.append("".join(current))
+    return max(runs, key=len) or None
+
+
+async def _run_rg(args: list[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+    """Run ripgrep with the search tools' timeout"""
+    return await run_subprocess(["rg", *args], timeout=10, cwd=cwd)
+
+
+async def _rg_candidates(pattern: str, candidates: list[str], options: list[str], limit: int) -> subprocess.CompletedProcess:
+    """Run the full pattern over prefiltered candidate files in batches, stopping at limit"""
+    matched = []
+    for i in range(0, len(candidates), _PREFILTER_BATCH_SIZE):
+        result = await _run_rg([*options, "--regexp", pattern, "--", *candidates[i:i + _PREFILTER_BATCH_SIZE]])
+        if result.returncode == 0:
+            matched.extend(result.stdout.splitlines())
+        elif result.returncode != 1:
+            return result
+        if len(matched) >= limit:
+            break
+
+    return subprocess.CompletedProcess(
+        result.args, 0 if matched else 1, stdout="\n".join(matched), stderr=""
+    )
+
+
 @register_tool("Grep")
-def execute_grep(tool: types.GrepTool, working_dir: str = ".") -> str:
+async def execute_grep(tool: types.GrepTool, working_dir: str = ".") -> str:
     """Search for pattern in files"""
     try:
         search_path = tool.path if tool.path else working_dir
 
-        # Build rg command
-        cmd = ["rg", tool.pattern, search_path, "--files-with-matches"]
+        # Build rg options
+        options = ["--files-with-matches", "--no-messages", "--threads", str(os.cpu_count() or 1)]
 
+        filters = []
         if tool.include:
-            cmd.extend(["--glob", tool.include])
+            if tool.include in _RG_TYPES:
+                filters.extend(["--type", _RG_TYPES[tool.include]])
+            else:
+                filters.extend(["--glob", tool.include])
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode == 0:
+        try:
+            # Plain strings don't need the regex engine
+            if re.escape(tool.pattern) == tool.pattern:
+                result = await _run_rg(["--fixed-strings", *options, *filters, "--regexp", tool.pattern, "--", search_path])
+            else:
+                literal = _required_literal(tool.pattern)
+                if literal and len(literal) >= _PREFILTER_MIN_LITERAL:
+                    # Two-pass search: a fast fixed-string pass finds candidate files,
+                    # then the full regex only runs on those candidates
+                    result = await _run_rg(["--fixed-strings", *options, *filters, "--regexp", literal, "--", search_path])
+                    if result.returncode == 0:
+                        result = await _rg_candidates(tool.pattern, result.stdout.splitlines(), options, limit=50)
+                else:
+                    result = await _run_rg([*options, *filters, "--regexp", tool.pattern, "--", search_path])
+        except FileNotFoundError:
+            # Fall back to searching in-process if rg is not available
+            try:
+                files = await asyncio.to_thread(
+                    _search_files_with_matches, tool.pattern, search_path, tool.include, 50
+                )
+            except re.error as e:
+                return f"Error: invalid regex pattern: {str(e)}"
+            if not files:
+                return f"No matches found for pattern: {tool.pattern}"
+        else:
+            if result.returncode == 1:
+                return f"No matches found for pattern: {tool.pattern}"
+            if result.returncode != 0:
+                return f"Error: {result.stderr}"
             files = result.stdout.strip().split("\n")
 
-            # Normalize paths to be relative to working_dir
-            working_dir_path = Path(working_dir).resolve()
-            normalized_files = []
-            for file in files[:50]:  # Limit to first 50 matches
-                try:
-                    file_path = Path(file).resolve()
-                    # Try to make it relative to working_dir
-                    try:
-                        relative_path = file_path.relative_to(working_dir_path)
-                        normalized_files.append(str(relative_path))
-                    except ValueError:
-                        # If it can't be made relative, use the absolute path
-                        normalized_files.append(file)
-                except Exception:
-                    # If there's any issue, just use the original path
-                    normalized_files.append(file)
-
-            return "\n".join(normalized_files)
-        elif result.returncode == 1:
-            return f"No matches found for pattern: {tool.pattern}"
-        else:
-            return f"Error: {result.stderr}"
-    except FileNotFoundError:
-        # Fallback to Python's re if rg is not available
-        return "Error: ripgrep (rg) not found. Please install ripgrep."
+        # Normalize paths to be relative to working_dir (limit to first 50 matches)
+        return "\n".join(_normalize_paths(files[:50], working_dir))
     except Exception as e:
         return f"Error executing grep: {str(e)}"
 
 
+@functools.lru_cache(maxsize=64)
+def _compile_ignore_patterns(patterns: tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Combine LS ignore globs into a single compiled regex.
+
+    Matching a name against the result is equivalent to fnmatch.fnmatch against
+    any of the patterns, but costs one regex match per entry instead of one
+    fnmatch call per pattern.
+    """
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
 @register_tool("LS")
 def execute_ls(tool: types.LSTool, working_dir: str = ".") -> str:
     """List files in a directory"""
@@ -143,20 +397,19 @@ def execute_ls(tool: types.LSTool, working_dir: str = ".") -> str:
         if not path.is_dir():
             return f"Not a directory: {tool.path}"
 
+        ignore_re = _compile_ignore_patterns(tuple(tool.ignore)) if tool.ignore else None
+
         items = []
-        for item in path.iterdir():
-            # Skip ignored patterns
-            if tool.ignore:
-                skip = False
-                for pattern in tool.ignore:
-                    if fnmatch.fnmatch(item.name, pattern):
-                        skip = True
-                        break
-                if skip:
+        # DirEntry carries the file type from the directory read, so only
+        # symlinks need an extra stat to classify
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # Skip ignored patterns
+                if ignore_re and ignore_re.match(os.path.normcase(entry.name)):
                     continue
 
-            item_type = "DIR " if item.is_dir() else "FILE"
-            items.append(f"{item_type} {item.name}")
+                item_type = "DIR " if entry.is_dir() else "FILE"
+                items.append(f"{item_type} {entry.name}")
 
         items.sort()
         return "\n".join(items) if items else "Empty directory"
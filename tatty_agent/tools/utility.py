@@ -8,6 +8,9 @@ This module contains utility and planning tools extracted from main.py:
 - NotebookRead: Read Jupyter notebook contents
 - NotebookEdit: Edit Jupyter notebook cells
 """
+import functools
+import json
+
 from ..baml_client import types
 from .registry import register_tool
 
@@ -15,6 +18,35 @@ from .registry import register_tool
 _todo_store: list[types.TodoItem] = []
 
 
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """The orjson module if installed, else None (resolved once per process)"""
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return None
+    return orjson
+
+
+def _load_notebook(path) -> dict:
+    """Parse a notebook file, using orjson when installed"""
+    orjson = _orjson()
+    if orjson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return orjson.loads(path.read_bytes())
+
+
+def _dump_notebook(path, notebook: dict) -> None:
+    """Serialize a notebook with 2-space indentation, using orjson when installed"""
+    orjson = _orjson()
+    if orjson is None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(notebook, f, indent=2)
+        return
+    path.write_bytes(orjson.dumps(notebook, option=orjson.OPT_INDENT_2))
+
+
 @register_tool("TodoRead")
 def execute_todo_read(tool: types.TodoReadTool, working_dir: str = ".") -> str:
     """Read the todo list from in-memory storage"""
@@ -57,7 +89,6 @@ def execute_exit_plan_mode(tool: types.ExitPlanModeTool, working_dir: str = ".")
 def execute_notebook_read(tool: types.NotebookReadTool, working_dir: str = ".") -> str:
     """Read Jupyter notebook contents"""
     try:
-        import json
         from pathlib import Path
 
         # If notebook_path is relative, make it relative to working_dir
@@ -69,8 +100,7 @@ def execute_notebook_read(tool: types.NotebookReadTool, working_dir: str = ".")
         if not path.exists():
             return f"Notebook not found: {tool.notebook_path}"
 
-        with open(path, 'r', encoding='utf-8') as f:
-            notebook = json.load(f)
+        notebook = _load_notebook(path)
 
         if 'cells' not in notebook:
             return f"Invalid notebook format: {tool.notebook_path}"
@@ -101,7 +131,6 @@ def execute_notebook_read(tool: types.NotebookReadTool, working_dir: str = ".")
 def execute_notebook_edit(tool: types.NotebookEditTool, working_dir: str = ".") -> str:
     """Edit Jupyter notebook cell"""
     try:
-        import json
         from pathlib import Path
 
         # If notebook_path is relative, make it relative to working_dir
@@ -113,8 +142,7 @@ def execute_notebook_edit(tool: types.NotebookEditTool, working_dir: str = ".")
         if not path.exists():
             return f"Notebook not found: {tool.notebook_path}"
 
-        with open(path, 'r', encoding='utf-8') as f:
-            notebook = json.load(f)
+        notebook = _load_notebook(path)
 
         if 'cells' not in notebook:
             return f"Invalid notebook format: {tool.notebook_path}"
@@ -141,8 +169,7 @@ def execute_notebook_edit(tool: types.NotebookEditTool, working_dir: str = ".")
             cell['cell_type'] = tool.cell_type
 
         # Write back to file
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(notebook, f, indent=2)
+        _dump_notebook(path, notebook)
 
         return f"Successfully updated cell {tool.cell_number} in {tool.notebook_path}"
     except Exception as e:
@@ -5,26 +5,82 @@ This module contains web-related tools extracted from main.py:
 - WebFetch: Fetch and process web content from URLs
 - WebSearch: Search the web using DuckDuckGo
 """
+import asyncio
+import functools
+import re
+
 from ..baml_client import types
 from .registry import register_tool
 
+# Whitespace runs spanning a line break: strips every line and drops blank ones
+_LINE_BREAK_RE = re.compile(r'\s*\n\s*')
 
-@register_tool("WebFetch")
-def execute_web_fetch(tool: types.WebFetchTool, working_dir: str = ".") -> str:
-    """Fetch and process web content"""
+
+@functools.lru_cache(maxsize=None)
+def _http_client():
+    """
+    Shared HTTP client, so repeated fetches reuse pooled keep-alive connections.
+
+    Prefers httpx with HTTP/2 when installed (httpx[http2]) and falls back to a
+    requests Session otherwise.
+    """
     try:
+        import httpx  # type: ignore
+        return httpx.Client(http2=True, timeout=10, follow_redirects=True)
+    except ImportError:
         import requests  # type: ignore
+        return requests.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _search_client():
+    """Shared DuckDuckGo client, reused across searches"""
+    from ddgs import DDGS
+    return DDGS()
+
+
+@functools.lru_cache(maxsize=None)
+def _html_to_text_impl():
+    """
+    Pick the HTML text extractor once per process.
+
+    Uses selectolax (lexbor, C) when installed and falls back to BeautifulSoup's
+    pure-Python parser otherwise. Caching the choice keeps a missing selectolax
+    from costing a failed import (a sys.path search) on every fetch.
+    """
+    try:
+        from selectolax.parser import HTMLParser  # type: ignore
+    except ImportError:
         from bs4 import BeautifulSoup  # type: ignore
+        return lambda html: BeautifulSoup(html, 'html.parser').get_text()
+
+    def extract(html: bytes) -> str:
+        tree = HTMLParser(html)
+        root = tree.body or tree.root
+        return root.text(separator='\n') if root is not None else ""
+
+    return extract
+
+
+def _html_to_text(html: bytes) -> str:
+    """Extract visible text from an HTML document"""
+    return _html_to_text_impl()(html)
+
 
-        response = requests.get(tool.url, timeout=10)
+@register_tool("WebFetch")
+async def execute_web_fetch(tool: types.WebFetchTool, working_dir: str = ".") -> str:
+    """Fetch and process web content"""
+    try:
+        client = _http_client()
+
+        # Blocking I/O runs in a worker thread so the event loop stays responsive
+        response = await asyncio.to_thread(client.get, tool.url, timeout=10)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        text = soup.get_text()
+        text = _html_to_text(response.content)
 
         # Simple markdown conversion (just cleaning up whitespace)
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        markdown_content = '\n'.join(lines)
+        markdown_content = _LINE_BREAK_RE.sub('\n', text).strip()
 
         # TODO: call haiku to summarize the content given the query and how its related.
 
@@ -42,22 +98,19 @@ def execute_web_fetch(tool: types.WebFetchTool, working_dir: str = ".") -> str:
 
 
 @register_tool("WebSearch")
-def execute_web_search(tool: types.WebSearchTool, working_dir: str = ".") -> str:
+async def execute_web_search(tool: types.WebSearchTool, working_dir: str = ".") -> str:
     """Search the web using DuckDuckGo search"""
     try:
-        from ddgs import DDGS
-
-        # Initialize DuckDuckGo client
-        ddgs = DDGS()
+        # Reuse the DuckDuckGo client (and its connections) across searches
+        ddgs = _search_client()
 
         # Perform search with content
         try:
-            # Get search results (limit to 5 for token efficiency)
-            search_results = list(ddgs.text(
-                tool.query,
-                max_results=5,
-                safesearch='moderate'
-            ))
+            # Get search results (limit to 5 for token efficiency); the request
+            # blocks, so it runs in a worker thread
+            search_results = await asyncio.to_thread(
+                lambda: list(ddgs.text(tool.query, max_results=5, safesearch='moderate'))
+            )
         except Exception as search_error:
             return f"Error performing search: {str(search_error)}"
 